@@ -1,33 +1,82 @@
 # automatas.py
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import chain
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+# matplotlib se importa dentro de las funciones que dibujan, para que los
+# motores (simular_1d, vida_2d, ...) funcionen sin entorno gráfico
 
 # --- AUTÓMATA 1D (Regla de Wolfram) ---
-def automata_1d(regla=30, pasos=100, tamaño=201):
+def simular_1d(regla=30, pasos=100, tamaño=201, periodico=False,
+               solo_final=False, inicial=None):
     """
-    Muestra la evolución del autómata 1D (reglas de Wolfram).
-    regla: entero 0-255 (ej: 110, 30, 90)
+    Motor sin gráficos del autómata 1D (reglas de Wolfram).
+    Cada generación se calcula de una vez: el código de vecindad 4a+2b+c de
+    todas las celdas se arma con desplazamientos y se traduce con la regla
+    como tabla de 8 entradas.
+    periodico: bordes envolventes; si es False los bordes quedan fijos en 0
+    inicial: fila inicial 0/1 (por defecto una sola celda viva al centro)
+    Devuelve la historia empaquetada en bits (pasos × ceil(tamaño/8), uint8,
+    ver desempacar_1d) o, con solo_final=True, la última fila como uint8 0/1.
     """
-    # inicial
-    estado = np.zeros(tamaño, dtype=int)
-    estado[tamaño // 2] = 1
+    # tabla[código] = bit de la regla para esa vecindad (código 7 = 111)
+    tabla = ((int(regla) >> np.arange(8)) & 1).astype(np.uint8)
+
+    if inicial is None:
+        estado = np.zeros(tamaño, dtype=np.uint8)
+        estado[tamaño // 2] = 1
+    else:
+        estado = np.asarray(inicial, dtype=np.uint8).copy()
+        tamaño = estado.size
+    nuevo = np.zeros_like(estado)
+    codigo = np.zeros_like(estado)
 
-    # regla en binario como string, MSB regla_bin[0]
-    regla_bin = np.binary_repr(int(regla), width=8)
-    matriz = np.zeros((pasos, tamaño), dtype=int)
-    matriz[0] = estado
+    historia = None
+    if not solo_final:
+        historia = np.zeros((pasos, (tamaño + 7) // 8), dtype=np.uint8)
+        historia[0] = np.packbits(estado)
 
     for i in range(1, pasos):
-        nuevo = np.zeros_like(estado)
-        # bordes fijos a 0 (o podríamos usar periodic)
-        for j in range(1, tamaño - 1):
-            a, b, c = estado[j - 1], estado[j], estado[j + 1]
-            bits = 4*a + 2*b + c   # valor entre 0 y 7
-            # índice en regla_bin: MSB corresponde a configuración 111 (bits=7)
-            nuevo[j] = int(regla_bin[7 - bits])
-        estado = nuevo
-        matriz[i] = estado
+        if periodico:
+            np.left_shift(estado, 1, out=codigo)
+            codigo |= np.roll(estado, 1) << 2
+            codigo |= np.roll(estado, -1)
+            np.take(tabla, codigo, out=nuevo)
+        else:
+            # bordes fijos a 0
+            nuevo[0] = nuevo[-1] = 0
+            if tamaño > 2:
+                c = codigo[1:-1]
+                np.left_shift(estado[:-2], 2, out=c)
+                c |= estado[1:-1] << 1
+                c |= estado[2:]
+                np.take(tabla, c, out=nuevo[1:-1])
+        estado, nuevo = nuevo, estado
+        if historia is not None:
+            historia[i] = np.packbits(estado)
+
+    if solo_final:
+        return estado
+    return historia
+
+def desempacar_1d(historia, tamaño):
+    """Convierte la historia empaquetada de simular_1d en una matriz 0/1."""
+    return np.unpackbits(historia, axis=1, count=tamaño)
+
+def automata_1d(regla=30, pasos=100, tamaño=201, periodico=False):
+    """
+    Muestra la evolución del autómata 1D (reglas de Wolfram).
+    regla: entero 0-255 (ej: 110, 30, 90)
+    """
+    matriz = desempacar_1d(simular_1d(regla, pasos, tamaño, periodico), tamaño)
+    dibujar_1d(matriz, regla)
 
+def dibujar_1d(matriz, regla):
+    """Dibuja la historia (matriz 0/1) de un autómata 1D."""
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(8,6))
     plt.imshow(matriz, cmap='binary', interpolation='nearest', aspect='auto')
     plt.title(f"Autómata 1D - Regla {regla}")
@@ -36,24 +85,553 @@ def automata_1d(regla=30, pasos=100, tamaño=201):
     plt.show()
 
 # --- AUTÓMATA 2D (Juego de la Vida) ---
-def automata_2d(tamaño=80, pasos=200, densidad=0.2, pausa=0.05):
+def iter_vida_2d(inicial, pasos, toroidal=True, cada=1):
+    """
+    Motor sin gráficos del Juego de la Vida.
+    inicial: matriz 0/1 (o booleana) con el estado de partida
+    toroidal: bordes envolventes; si es False, fuera de la malla todo está muerto
+    cada: entrega (como copia uint8) una de cada `cada` generaciones y
+        siempre la última
+    Trabaja sobre buffers uint8 reservados una sola vez: la malla vive dentro
+    de un marco de una celda y la suma 3x3 se hace por filas y luego por
+    columnas, sin arreglos temporales por paso.
+    """
+    inicial = np.asarray(inicial)
+    f, c = inicial.shape
+    marco = np.zeros((f + 2, c + 2), dtype=np.uint8)
+    malla = marco[1:-1, 1:-1]
+    malla[...] = inicial != 0
+    filas = np.empty((f + 2, c), dtype=np.uint8)
+    suma = np.empty((f, c), dtype=np.uint8)
+    nace = np.empty((f, c), dtype=bool)
+    vive = np.empty((f, c), dtype=bool)
+
+    for paso in range(1, pasos + 1):
+        if toroidal:
+            marco[0, 1:-1] = marco[-2, 1:-1]
+            marco[-1, 1:-1] = marco[1, 1:-1]
+            marco[:, 0] = marco[:, -2]
+            marco[:, -1] = marco[:, 1]
+        # suma 3x3 incluyendo la celda: 3 -> nace o sobrevive, 4 -> sobrevive si vive
+        np.add(marco[:, :-2], marco[:, 1:-1], out=filas)
+        filas += marco[:, 2:]
+        np.add(filas[:-2], filas[1:-1], out=suma)
+        suma += filas[2:]
+        np.equal(suma, 3, out=nace)
+        np.equal(suma, 4, out=vive)
+        vive &= malla.view(bool)
+        np.bitwise_or(nace, vive, out=malla.view(bool))
+        if cada and (paso % cada == 0 or paso == pasos):
+            yield malla.copy()
+
+# claves int64 para coordenadas: (fila + 2^30)·2^32 + (columna + 2^31), de modo
+# que desplazar una celda equivale a sumar una constante a su clave
+_BASE_FILA, _BASE_COL = 1 << 30, 1 << 31
+_VECINOS_CLAVE = np.array([i * (1 << 32) + j
+                           for i in (-1, 0, 1) for j in (-1, 0, 1)
+                           if not (i == 0 and j == 0)], dtype=np.int64)
+
+def _a_claves(vivas):
+    vivas = np.asarray(vivas, dtype=np.int64).reshape(-1, 2)
+    return np.unique((vivas[:, 0] + _BASE_FILA) * (1 << 32) + (vivas[:, 1] + _BASE_COL))
+
+def _a_coordenadas(claves):
+    return np.column_stack([(claves >> 32) - _BASE_FILA,
+                            (claves & 0xFFFFFFFF) - _BASE_COL])
+
+def _dentro(claves, forma):
+    """Se queda con las claves cuyas coordenadas caen en una malla de esa forma."""
+    filas = (claves >> 32) - _BASE_FILA
+    columnas = (claves & 0xFFFFFFFF) - _BASE_COL
+    return claves[(filas >= 0) & (filas < forma[0]) & (columnas >= 0) & (columnas < forma[1])]
+
+def iter_vida_dispersa(vivas, pasos, cada=1, forma=None):
+    """
+    Motor disperso del Juego de la Vida sobre un plano sin bordes.
+    vivas: arreglo (k, 2) con las coordenadas (fila, columna) de las celdas vivas
+    cada: entrega las coordenadas vivas una de cada `cada` generaciones y
+        siempre las de la última
+    forma: (filas, columnas) de una malla con bordes muertos; las celdas que
+        salen de ella se descartan en cada generación (como en iter_vida_2d
+        con toroidal=False)
+    Solo se guardan las celdas vivas (como claves enteras ordenadas), así que
+    la memoria depende de la población y no del tamaño de la región.
+    """
+    claves = _a_claves(vivas)
+    if forma is not None:
+        claves = _dentro(claves, forma)
+    for paso in range(1, pasos + 1):
+        if claves.size:
+            candidatas, cuenta = np.unique((claves[:, None] + _VECINOS_CLAVE).ravel(),
+                                           return_counts=True)
+            pos = np.minimum(np.searchsorted(claves, candidatas), claves.size - 1)
+            viva = claves[pos] == candidatas
+            claves = candidatas[(cuenta == 3) | ((cuenta == 2) & viva)]
+            if forma is not None:
+                claves = _dentro(claves, forma)
+        if cada and (paso % cada == 0 or paso == pasos):
+            yield _a_coordenadas(claves)
+
+def vida_dispersa(vivas, pasos, forma=None):
+    """
+    Coordenadas (fila, columna) de las celdas vivas tras `pasos` generaciones
+    (forma: como en iter_vida_dispersa).
+    """
+    claves = _a_claves(vivas)
+    final = _a_coordenadas(claves if forma is None else _dentro(claves, forma))
+    for final in iter_vida_dispersa(vivas, pasos, cada=pasos, forma=forma):
+        pass
+    return final
+
+def vida_2d(inicial, pasos, toroidal=True, motor="denso"):
+    """
+    Estado final (uint8 0/1) del Juego de la Vida tras `pasos` generaciones.
+    motor: "denso" (iter_vida_2d) o "disperso" (iter_vida_dispersa); ambos
+    dan el mismo resultado. El disperso solo admite toroidal=False: descarta
+    en cada generación las celdas que salen de la malla.
+    """
+    if motor == "disperso":
+        if toroidal:
+            raise ValueError("El motor disperso trabaja sobre un plano sin bordes; use toroidal=False.")
+        inicial = np.asarray(inicial)
+        final = np.zeros(inicial.shape, dtype=np.uint8)
+        vivas = vida_dispersa(np.argwhere(inicial), pasos, forma=inicial.shape)
+        final[tuple(vivas.T)] = 1
+        return final
+    if motor != "denso":
+        raise ValueError(f"Motor desconocido: {motor}")
+    final = np.asarray(inicial, dtype=np.uint8) != 0
+    for final in iter_vida_2d(inicial, pasos, toroidal, cada=pasos):
+        pass
+    return final.astype(np.uint8)
+
+# --- ANIMACIÓN (dibujo desacoplado de la simulación) ---
+def reducir(matriz, lado_max, modo="max"):
+    """
+    Achica una malla más grande que lado_max celdas por lado agrupándola en
+    bloques k×k: "max" se queda con el mayor valor del bloque (una celda
+    viva no desaparece) y "salto" con una celda de cada bloque.
+    """
+    matriz = np.asarray(matriz)
+    k = -(-max(matriz.shape) // max(int(lado_max), 1))
+    if k <= 1:
+        return matriz
+    if modo == "salto":
+        return matriz[::k, ::k]
+    if modo != "max":
+        raise ValueError(f"Modo de reducción desconocido: {modo}")
+    f, c = matriz.shape
+    relleno = np.zeros((-(-f // k) * k, -(-c // k) * k), dtype=matriz.dtype)
+    relleno[:f, :c] = matriz
+    return relleno.reshape(relleno.shape[0] // k, k, relleno.shape[1] // k, k).max(axis=(1, 3))
+
+class Animacion:
+    """
+    Muestra o graba una sucesión de mallas (cuadros) de una simulación.
+    fps: cuadros por segundo en pantalla (None: tan rápido como se dibuje)
+    saltar: si es True la simulación no espera al dibujo y se descartan los
+        cuadros que llegan antes de tiempo; si es False cada cuadro se muestra
+        1/fps segundos
+    cada: pasos de simulación entre cuadros (solo para el contador); para
+        dibujar uno de cada k pasos conviene pedirle cada=k al motor, que así
+        ni copia los demás
+    total: pasos de la simulación; como los motores entregan siempre la
+        última generación, el último cuadro puede estar a menos de `cada`
+        pasos del anterior
+    reduccion: cómo achicar mallas con más celdas que píxeles ("max" o "salto")
+    En pantalla solo se redibujan la imagen y el contador (blitting); el resto
+    de la figura se pinta una vez.
+    """
+    def __init__(self, titulo, cmap="binary", niveles=None, vmin=0, vmax=1,
+                 fps=20, saltar=False, cada=1, total=None, reduccion="max"):
+        self.titulo = titulo
+        self.cmap = cmap
+        self.niveles = niveles
+        self.vmin = vmin
+        self.vmax = vmax
+        self.fps = fps
+        self.saltar = saltar
+        self.cada = max(int(cada), 1)
+        self.total = total
+        self.reduccion = reduccion
+
+    def _paso(self, i):
+        """Paso de simulación del cuadro i (el 0 es el estado inicial)."""
+        paso = i * self.cada
+        return paso if self.total is None else min(paso, self.total)
+
+    def _imagen(self, ax, cuadro, lado, forma):
+        import matplotlib.pyplot as plt
+        f, c = forma
+        # extent en celdas de la malla original aunque se dibuje reducida
+        return ax.imshow(reducir(cuadro, lado, self.reduccion),
+                         cmap=plt.get_cmap(self.cmap, self.niveles),
+                         vmin=self.vmin, vmax=self.vmax, interpolation="nearest",
+                         extent=(-0.5, c - 0.5, f - 0.5, -0.5))
+
+    def mostrar(self, cuadros):
+        """Anima los cuadros en una ventana; devuelve cuántos se dibujaron."""
+        import time
+        import matplotlib.pyplot as plt
+        cuadros = iter(cuadros)
+        primero = next(cuadros, None)
+        if primero is None:
+            return 0
+        forma = np.shape(primero)
+        fig, ax = plt.subplots(figsize=(6, 6))
+        ax.set_title(self.titulo)
+        fig.canvas.draw()
+        caja = ax.get_window_extent()
+        lado = min(caja.width, caja.height)  # píxeles disponibles para la malla
+        im = self._imagen(ax, primero, lado, forma)
+        contador = ax.text(0.02, 0.98, "Paso 0", transform=ax.transAxes, va="top",
+                           bbox={"facecolor": "white", "alpha": 0.7})
+        im.set_animated(True)
+        contador.set_animated(True)
+        canvas = fig.canvas
+        blit = getattr(canvas, "supports_blit", False)
+        fondo = []
+
+        def pintar():
+            if blit:
+                if fondo:
+                    canvas.restore_region(fondo[0])
+                ax.draw_artist(im)
+                ax.draw_artist(contador)
+                canvas.blit(ax.bbox)
+            else:
+                canvas.draw_idle()
+            canvas.flush_events()
+
+        def capturar(evento):
+            # cada redibujo completo (p. ej. al cambiar el tamaño) renueva el fondo
+            fondo[:] = [canvas.copy_from_bbox(ax.bbox)]
+            ax.draw_artist(im)
+            ax.draw_artist(contador)
+
+        conexion = canvas.mpl_connect("draw_event", capturar) if blit else None
+        plt.show(block=False)
+        canvas.draw()
+        canvas.flush_events()
+
+        intervalo = 1.0 / self.fps if self.fps else 0.0
+        proximo = time.perf_counter() + intervalo
+        dibujados, pendiente = 1, None
+        for i, cuadro in enumerate(cuadros, 1):
+            if not plt.fignum_exists(fig.number):
+                break
+            ahora = time.perf_counter()
+            if ahora < proximo:
+                if self.saltar:
+                    pendiente = (i, cuadro)
+                    continue
+                canvas.start_event_loop(proximo - ahora)  # espera atendiendo la ventana
+            pendiente = None
+            im.set_data(reducir(cuadro, lado, self.reduccion))
+            contador.set_text(f"Paso {self._paso(i)}")
+            pintar()
+            dibujados += 1
+            proximo = time.perf_counter() + intervalo
+        if pendiente is not None and plt.fignum_exists(fig.number):
+            # el último estado siempre queda en pantalla
+            i, cuadro = pendiente
+            im.set_data(reducir(cuadro, lado, self.reduccion))
+            contador.set_text(f"Paso {self._paso(i)}")
+            pintar()
+            dibujados += 1
+        if conexion is not None:
+            canvas.mpl_disconnect(conexion)
+        if plt.fignum_exists(fig.number):
+            im.set_animated(False)
+            contador.set_animated(False)
+            canvas.draw_idle()
+            plt.show()
+        return dibujados
+
+    def grabar(self, cuadros, ruta, lado_max=None, dpi=100):
+        """
+        Guarda los cuadros sin mostrarlos. Con extensión .npz cada cuadro va
+        comprimido como cuadro_000000, cuadro_000001... a medida que llega
+        (la memoria no crece con la cantidad de cuadros; leer_grabacion los
+        junta). .gif usa Pillow y .mp4/.avi/.mkv/.webm necesitan ffmpeg.
+        lado_max: achica las mallas más grandes (en video, por defecto, a
+        los píxeles de la figura). Devuelve la ruta absoluta.
+        """
+        ext = os.path.splitext(ruta)[1].lower()
+        if ext == ".npz":
+            import zipfile
+            with zipfile.ZipFile(ruta, "w", zipfile.ZIP_DEFLATED) as zf:
+                n = 0
+                for n, cuadro in enumerate(cuadros, 1):
+                    if lado_max:
+                        cuadro = reducir(cuadro, lado_max, self.reduccion)
+                    with zf.open(f"cuadro_{n - 1:06d}.npy", "w", force_zip64=True) as f:
+                        np.lib.format.write_array(f, np.ascontiguousarray(cuadro, dtype=np.uint8))
+                with zf.open("pasos.npy", "w") as f:
+                    np.lib.format.write_array(f, np.array([self._paso(i) for i in range(n)], dtype=np.int64))
+            return os.path.abspath(ruta)
+        if ext not in (".gif", ".mp4", ".avi", ".mkv", ".webm"):
+            raise ValueError(f"Formato de grabación no soportado: {ext or ruta}")
+        # figura sin pyplot: se dibuja con Agg y no abre ninguna ventana
+        from matplotlib import animation
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        escritor = "pillow" if ext == ".gif" else "ffmpeg"
+        if not animation.writers.is_available(escritor):
+            raise ValueError(f"No se puede grabar {ext}: falta {escritor}.")
+        cuadros = iter(cuadros)
+        primero = next(cuadros, None)
+        if primero is None:
+            raise ValueError("No hay cuadros para grabar.")
+        fig = Figure(figsize=(6, 6), dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.set_title(self.titulo)
+        lado = lado_max or int(min(fig.get_size_inches()) * dpi)
+        im = self._imagen(ax, primero, lado, np.shape(primero))
+        contador = ax.text(0.02, 0.98, "Paso 0", transform=ax.transAxes, va="top",
+                           bbox={"facecolor": "white", "alpha": 0.7})
+        video = animation.writers[escritor](fps=self.fps or 20)
+        with video.saving(fig, ruta, dpi):
+            video.grab_frame()
+            for i, cuadro in enumerate(cuadros, 1):
+                im.set_data(reducir(cuadro, lado, self.reduccion))
+                contador.set_text(f"Paso {self._paso(i)}")
+                video.grab_frame()
+        return os.path.abspath(ruta)
+
+def leer_grabacion(ruta):
+    """(cuadros, pasos) de un .npz de Animacion.grabar; cuadros es (n, filas, columnas)."""
+    with np.load(ruta) as datos:
+        nombres = sorted(k for k in datos.files if k.startswith("cuadro_"))
+        pasos = datos["pasos"]
+        if not nombres:
+            return np.empty((0, 0, 0), dtype=np.uint8), pasos
+        cuadros = np.stack([datos[k] for k in nombres])
+    return cuadros, pasos
+
+def automata_2d(tamaño=80, pasos=200, densidad=0.2, pausa=0.05, toroidal=True,
+                cada=1, saltar=False, grabar=None):
+    """
+    Juego de la Vida sobre una malla aleatoria, animado con Animacion.
+    pausa: segundos por cuadro en pantalla (0 o None: sin esperar)
+    cada: dibuja una de cada `cada` generaciones
+    saltar: la simulación no espera al dibujo (se descartan cuadros)
+    grabar: ruta .npz/.gif/.mp4 donde guardar los cuadros en vez de mostrarlos
+    """
     matriz = np.random.rand(tamaño, tamaño) < densidad
-    plt.figure(figsize=(6,6))
-    im = plt.imshow(matriz, cmap='binary', interpolation='nearest')
-    plt.title("Juego de la Vida (2D)")
-    for _ in range(pasos):
-        vecinos = sum(np.roll(np.roll(matriz, i, 0), j, 1)
-                      for i in (-1, 0, 1) for j in (-1, 0, 1)
-                      if not (i == 0 and j == 0))
-        nueva = (vecinos == 3) | (matriz & (vecinos == 2))
-        matriz = nueva
-        im.set_data(matriz)
-        plt.pause(pausa)
-    plt.show()
+    cuadros = chain([matriz.astype(np.uint8)], iter_vida_2d(matriz, pasos, toroidal, cada))
+    animacion = Animacion("Juego de la Vida (2D)", fps=1 / pausa if pausa else None,
+                          saltar=saltar, cada=cada, total=pasos)
+    if grabar:
+        return animacion.grabar(cuadros, grabar)
+    return animacion.mostrar(cuadros)
 
 # --- SIMULACIÓN COVID SIMPLE (SIR en autómata celular 2D) ---
+class _FranjaSIR:
+    """
+    Franja horizontal de filas [r0, r1) de la malla SIR con sus propios
+    buffers y su propio np.random.Generator. Cada paso lee una fila de halo
+    arriba y abajo de la malla actual y escribe solo sus filas en la nueva.
+    """
+    def __init__(self, r0, r1, tamaño, umbrales, rng):
+        self.r0, self.r1, self.rng = r0, r1, rng
+        self.umbrales = umbrales
+        h = r1 - r0
+        self.infectados = np.zeros((h + 2, tamaño + 2), dtype=np.uint8)
+        self.filas = np.empty((h + 2, tamaño), dtype=np.uint8)
+        self.indice = np.empty((h, tamaño), dtype=np.uint8)
+        self.umbral = np.empty((h, tamaño), dtype=np.float32)
+        self.azar = np.empty((h, tamaño), dtype=np.float32)
+        self.cambia = np.empty((h, tamaño), dtype=bool)
+
+    def inicial(self, matriz, densidad_inicial):
+        self.rng.random(dtype=np.float32, out=self.azar)
+        np.less(self.azar, densidad_inicial, out=matriz[self.r0:self.r1].view(bool))
+        return _conteos_sir(matriz[self.r0:self.r1])
+
+    def paso(self, actual, nueva):
+        r0, r1, n = self.r0, self.r1, actual.shape[0]
+        inf = self.infectados
+        # intercambio de halo (bordes toroidales, como np.roll)
+        np.equal(actual[(r0 - 1) % n], 1, out=inf[0, 1:-1].view(bool))
+        np.equal(actual[r0:r1], 1, out=inf[1:-1, 1:-1].view(bool))
+        np.equal(actual[r1 % n], 1, out=inf[-1, 1:-1].view(bool))
+        inf[:, 0] = inf[:, -2]
+        inf[:, -1] = inf[:, 1]
+        # infectados en la vecindad 3x3 (incluye la celda, ver _umbrales_sir)
+        np.add(inf[:, :-2], inf[:, 1:-1], out=self.filas)
+        self.filas += inf[:, 2:]
+        np.add(self.filas[:-2], self.filas[1:-1], out=self.indice)
+        self.indice += self.filas[2:]
+        # índice = estado·10 + cuenta -> probabilidad de pasar al estado siguiente
+        estado = actual[r0:r1]
+        self.indice += estado * np.uint8(10)
+        np.take(self.umbrales, self.indice, out=self.umbral)
+        self.rng.random(dtype=np.float32, out=self.azar)
+        np.less(self.azar, self.umbral, out=self.cambia)
+        np.add(estado, self.cambia, out=nueva[r0:r1])
+        return _conteos_sir(nueva[r0:r1])
+
+def _conteos_sir(matriz):
+    """[S, I, R] a partir de dos reducciones: no nulos = I+R y suma = I+2R."""
+    no_nulos = np.count_nonzero(matriz)
+    r = int(matriz.sum(dtype=np.int64)) - no_nulos
+    return np.array([matriz.size - no_nulos, no_nulos - r, r], dtype=np.int64)
+
+def _umbrales_sir(p_infeccion, p_recuperacion):
+    """
+    Tabla de 30 probabilidades indexada por estado·10 + infectados en la
+    vecindad 3x3: S con k vecinos infectados -> 1-(1-p_infeccion)^k,
+    I -> p_recuperacion, R -> 0. Un solo número aleatorio por celda basta
+    porque cada celda solo puede hacer una de las dos transiciones.
+    """
+    umbrales = np.zeros(30, dtype=np.float32)
+    umbrales[:10] = 1 - (1 - p_infeccion) ** np.arange(10)
+    umbrales[10:20] = p_recuperacion
+    return umbrales
+
+def _pasos_sir(tamaño, pasos, densidad_inicial, p_infeccion, p_recuperacion,
+               semilla, workers):
+    """Recorre la simulación entregando (malla actual, conteos S/I/R) por paso."""
+    franjas_n = max(1, min(int(workers), tamaño))
+    if not isinstance(semilla, np.random.SeedSequence):
+        semilla = np.random.SeedSequence(semilla)
+    rngs = [np.random.default_rng(s) for s in semilla.spawn(franjas_n)]
+    cortes = np.linspace(0, tamaño, franjas_n + 1).astype(int)
+    umbrales = _umbrales_sir(p_infeccion, p_recuperacion)
+    franjas = [_FranjaSIR(cortes[i], cortes[i + 1], tamaño, umbrales, rngs[i])
+               for i in range(franjas_n)]
+    actual = np.zeros((tamaño, tamaño), dtype=np.uint8)
+    nueva = np.empty_like(actual)
+
+    pool = ThreadPoolExecutor(max_workers=franjas_n) if franjas_n > 1 else None
+    try:
+        yield actual, sum(f.inicial(actual, densidad_inicial) for f in franjas)
+        for _ in range(pasos):
+            if pool is None:
+                conteos = franjas[0].paso(actual, nueva)
+            else:
+                conteos = sum(pool.map(lambda f: f.paso(actual, nueva), franjas))
+            actual, nueva = nueva, actual
+            yield actual, conteos
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+def sir_2d(tamaño=80, pasos=200, densidad_inicial=0.02, p_infeccion=0.3,
+           p_recuperacion=0.05, semilla=None, workers=1):
+    """
+    Motor sin gráficos de la simulación SIR.
+    La malla se reparte en `workers` franjas que avanzan en paralelo en un
+    pool de hilos; cada franja usa su propio generador derivado de
+    SeedSequence(semilla) (semilla puede ser un entero o una SeedSequence),
+    así que el resultado es reproducible para una misma semilla y número
+    de workers.
+    Devuelve (serie, final): serie es un arreglo (pasos+1, 3) con los
+    conteos S, I, R por paso y final la malla uint8 del último paso.
+    """
+    serie = np.empty((pasos + 1, 3), dtype=np.int64)
+    for i, (matriz, conteos) in enumerate(_pasos_sir(
+            tamaño, pasos, densidad_inicial, p_infeccion, p_recuperacion,
+            semilla, workers)):
+        serie[i] = conteos
+    return serie, matriz.copy()
+
+def iter_sir_2d(tamaño=80, pasos=200, densidad_inicial=0.02, p_infeccion=0.3,
+                p_recuperacion=0.05, semilla=None, workers=1, cada=1, serie=None):
+    """
+    Igual que sir_2d, pero entrega una copia de la malla cada `cada` pasos y
+    siempre la del último.
+    serie: arreglo (pasos+1, 3) opcional donde se escriben los conteos S, I, R
+        de todos los pasos, también de los que no se entregan
+    """
+    for i, (matriz, conteos) in enumerate(_pasos_sir(
+            tamaño, pasos, densidad_inicial, p_infeccion, p_recuperacion,
+            semilla, workers)):
+        if serie is not None:
+            serie[i] = conteos
+        if i % cada == 0 or i == pasos:
+            yield matriz.copy()
+
+def _replica_sir(args):
+    """Una réplica de sir_2d para el pool de ensamble_sir (solo la serie S/I/R)."""
+    return sir_2d(*args)[0]
+
+def ensamble_sir(p_infeccion=(0.25,), p_recuperacion=(0.03,), replicas=100,
+                 tamaño=80, pasos=200, densidad_inicial=0.02, semilla=None,
+                 workers=None, cuantiles=(0.05, 0.95), progreso=None,
+                 cancelar=None):
+    """
+    Ensamble Monte Carlo de sir_2d sobre la malla de parámetros
+    p_infeccion × p_recuperacion, con `replicas` corridas por combinación
+    repartidas en un pool de procesos. Cada réplica tiene su propia semilla
+    derivada de SeedSequence(semilla), así que el ensamble es reproducible.
+    progreso(hechas, total): se llama cada vez que termina una réplica
+    cancelar(): si devuelve True se descartan las réplicas pendientes y la
+    función devuelve None
+    Devuelve un diccionario con:
+      curvas: (n_inf, n_rec, replicas, pasos+1, 3) conteos S/I/R por paso
+      media: (n_inf, n_rec, pasos+1, 3)
+      bandas: (len(cuantiles), n_inf, n_rec, pasos+1, 3)
+      pico: (n_inf, n_rec, replicas) paso con más infectados de cada réplica
+    """
+    p_infeccion = np.atleast_1d(np.asarray(p_infeccion, dtype=float))
+    p_recuperacion = np.atleast_1d(np.asarray(p_recuperacion, dtype=float))
+    forma = (p_infeccion.size, p_recuperacion.size, replicas)
+    curvas = np.empty(forma + (pasos + 1, 3), dtype=np.int64)
+    semillas = np.random.SeedSequence(semilla).spawn(int(np.prod(forma)))
+    tareas = {}
+    for k, (i, j, r) in enumerate(np.ndindex(*forma)):
+        tareas[(i, j, r)] = (tamaño, pasos, densidad_inicial, p_infeccion[i],
+                             p_recuperacion[j], semillas[k])
+    total = len(tareas)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for hechas, (idx, args) in enumerate(tareas.items(), 1):
+            if cancelar is not None and cancelar():
+                return None
+            curvas[idx] = _replica_sir(args)
+            if progreso is not None:
+                progreso(hechas, total)
+    else:
+        # spawn: el dashboard llama desde un hilo del planificador, y hacer
+        # fork de un proceso con hilos (y Tk) no es seguro
+        pool = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+        cancelado = True
+        try:
+            pendientes = {pool.submit(_replica_sir, args): idx
+                          for idx, args in tareas.items()}
+            hechas = 0
+            while pendientes:
+                if cancelar is not None and cancelar():
+                    return None
+                listos, _ = wait(pendientes, timeout=0.1, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    curvas[pendientes.pop(futuro)] = futuro.result()
+                    hechas += 1
+                    if progreso is not None:
+                        progreso(hechas, total)
+            cancelado = False
+        finally:
+            # sin with: al cancelar no se espera a las réplicas que ya corren
+            pool.shutdown(wait=not cancelado, cancel_futures=cancelado)
+
+    return {
+        "p_infeccion": p_infeccion,
+        "p_recuperacion": p_recuperacion,
+        "curvas": curvas,
+        "media": curvas.mean(axis=2),
+        "cuantiles": np.asarray(cuantiles),
+        "bandas": np.quantile(curvas, cuantiles, axis=2),
+        "pico": curvas[..., 1].argmax(axis=-1),
+    }
+
 def simulacion_covid_2d(tamaño=80, pasos=200, densidad_inicial=0.02,
-                        p_infeccion=0.3, p_recuperacion=0.05, pausa=0.05):
+                        p_infeccion=0.3, p_recuperacion=0.05, pausa=0.05,
+                        semilla=None, cada=1, saltar=False, grabar=None):
     """
     Estados:
       0: Susceptible (S)
@@ -61,35 +639,16 @@ def simulacion_covid_2d(tamaño=80, pasos=200, densidad_inicial=0.02,
       2: Recuperado (R)
     p_infeccion: probabilidad por vecino infectado por paso
     p_recuperacion: probabilidad de recuperación por paso
+    pausa, cada, saltar, grabar: como en automata_2d
     """
-    # inicial: todos susceptibles excepto algunos infectados
-    matriz = np.zeros((tamaño, tamaño), dtype=int)
-    # poner infectados aleatorios según densidad_inicial
-    infectados = np.random.rand(tamaño, tamaño) < densidad_inicial
-    matriz[infectados] = 1
-
-    plt.figure(figsize=(6,6))
-    cmap = plt.get_cmap('viridis', 3)  # 3 colores discretos
-    im = plt.imshow(matriz, cmap=cmap, vmin=0, vmax=2, interpolation='nearest')
-    plt.title("Simulación COVID (SIR) - 0:S 1:I 2:R")
-
-    for _ in range(pasos):
-        vecinos_inf = sum(np.roll(np.roll(matriz == 1, i, 0), j, 1)
-                          for i in (-1, 0, 1) for j in (-1, 0, 1)
-                          if not (i == 0 and j == 0))
-        nueva = matriz.copy()
-        # susceptibles que se infectan si tienen vecinos infectados (probabilístico)
-        susceptible = (matriz == 0)
-        prob_contagio = 1 - (1 - p_infeccion) ** vecinos_inf  # prob se infecte por al menos uno
-        rand = np.random.rand(tamaño, tamaño)
-        nueva[np.logical_and(susceptible, rand < prob_contagio)] = 1
-
-        # infectados que se recuperan
-        rand2 = np.random.rand(tamaño, tamaño)
-        nueva[np.logical_and(matriz == 1, rand2 < p_recuperacion)] = 2
-
-        matriz = nueva
-        im.set_data(matriz)
-        plt.pause(pausa)
-
-    plt.show()
+    frames = iter_sir_2d(tamaño, pasos, densidad_inicial, p_infeccion,
+                         p_recuperacion, semilla, cada=cada)
+    # 3 colores discretos; al reducir se toma una celda por bloque para no
+    # ocultar los infectados bajo los recuperados
+    animacion = Animacion("Simulación COVID (SIR) - 0:S 1:I 2:R", cmap="viridis",
+                          niveles=3, vmax=2, fps=1 / pausa if pausa else None,
+                          saltar=saltar, cada=cada, total=pasos,
+                          reduccion="salto")
+    if grabar:
+        return animacion.grabar(frames, grabar)
+    return animacion.mostrar(frames)
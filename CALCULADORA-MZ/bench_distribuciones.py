@@ -0,0 +1,73 @@
+# bench_distribuciones.py
+"""
+Compara el backend de dist_* (np.random.Generator; tablas de alias para
+Binomial, Poisson y pmf arbitrarias) contra el camino anterior con
+scipy.stats.<dist>.rvs. Uso:
+    python bench_distribuciones.py [n] [repeticiones]
+"""
+import sys
+import time
+
+import numpy as np
+from scipy import stats
+
+import generators as g
+
+# (nombre, función nueva, sus parámetros, llamada equivalente con scipy, es continua)
+CASOS = [
+    ("Uniforme continua", g.dist_uniforme_continua, dict(a=0.0, b=1.0),
+     lambda n: stats.uniform.rvs(loc=0.0, scale=1.0, size=n), True),
+    ("Exponencial", g.dist_exponencial, dict(lam=1.0),
+     lambda n: stats.expon.rvs(scale=1.0, size=n), True),
+    ("Erlang", g.dist_erlang, dict(k=2, lam=1.0),
+     lambda n: stats.erlang.rvs(2, scale=1.0, size=n), True),
+    ("Gamma", g.dist_gamma, dict(alpha=2.0, lam=1.0),
+     lambda n: stats.gamma.rvs(2.0, scale=1.0, size=n), True),
+    ("Normal", g.dist_normal, dict(mu=0.0, sigma=1.0),
+     lambda n: stats.norm.rvs(loc=0.0, scale=1.0, size=n), True),
+    ("Weibull", g.dist_weibull, dict(k=1.5, lam=1.0),
+     lambda n: stats.weibull_min.rvs(c=1.5, scale=1.0, size=n), True),
+    ("Uniforme discreta", g.dist_uniforme_discreta, dict(a=1, b=6),
+     lambda n: np.random.randint(1, 7, size=n), False),
+    ("Bernoulli", g.dist_bernoulli, dict(p=0.5),
+     lambda n: stats.bernoulli.rvs(0.5, size=n), False),
+    ("Binomial", g.dist_binomial, dict(n_ensayos=10, p=0.5),
+     lambda n: stats.binom.rvs(10, 0.5, size=n), False),
+    ("Poisson", g.dist_poisson, dict(lam=3.0),
+     lambda n: stats.poisson.rvs(mu=3.0, size=n), False),
+    ("Discreta (pmf)", g.dist_discreta, dict(pmf=[0.1, 0.2, 0.3, 0.4], valores=[-2, 0, 5, 9]),
+     lambda n: stats.rv_discrete(values=([-2, 0, 5, 9], [0.1, 0.2, 0.3, 0.4])).rvs(size=n), False),
+]
+
+def _mejor(f, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        f()
+        tiempos.append(time.perf_counter() - t0)
+    return min(tiempos)
+
+def _parecidas(a, b, continua):
+    """p-valor de que ambas muestras vengan de la misma distribución."""
+    if continua:
+        return stats.ks_2samp(a, b).pvalue
+    valores = np.union1d(a, b)
+    tabla = np.array([[np.sum(a == v), np.sum(b == v)] for v in valores])
+    tabla = tabla[tabla.sum(axis=1) >= 10]
+    return stats.chi2_contingency(tabla)[1] if len(tabla) > 1 else 1.0
+
+def main(n=1_000_000, repeticiones=5):
+    print(f"n = {n}, mejor de {repeticiones}")
+    print(f"{'Distribución':<18} {'scipy (ms)':>11} {'Generator (ms)':>15} {'out= (ms)':>10} {'x':>6} {'p misma dist.':>14}")
+    for nombre, nueva, params, vieja, continua in CASOS:
+        rng = g.crear_rng(12345)
+        buf = np.empty(n, dtype=float if continua else np.int64)
+        t_vieja = _mejor(lambda: vieja(n), repeticiones)
+        t_nueva = _mejor(lambda: nueva(n=n, semilla=rng, **params), repeticiones)
+        t_out = _mejor(lambda: nueva(semilla=rng, out=buf, **params), repeticiones)
+        p = _parecidas(nueva(n=200_000, semilla=rng, **params), vieja(200_000), continua)
+        print(f"{nombre:<18} {t_vieja*1000:>11.1f} {t_nueva*1000:>15.1f} {t_out*1000:>10.1f} "
+              f"{t_vieja/t_nueva:>6.1f} {p:>14.3f}")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,363 @@
+# bench_regresion.py
+"""
+Suite de rendimiento y regresión para generators, tests y automatas.
+  - Verifica que los generadores clásicos reproduzcan exactamente las
+    secuencias de referencia (referencias/secuencias.json) con generar(),
+    iter_chunks() y generar_paralelo().
+  - Verifica que transformadas.calidad rechace muestras degeneradas.
+  - Compara filas al azar de las tablas de semillas.py con un recorrido
+    valor a valor (productos medios solo con --semillas: tarda minutos).
+  - Mide cada generador, dist_*, prueba y autómata sobre varios tamaños:
+    tiempo (mejor de r), valores por segundo y memoria pico (tracemalloc).
+  - Guarda los resultados en JSON y los compara con una base guardada,
+    marcando lo que sea más lento o use más memoria que la tolerancia.
+Uso:
+    python bench_regresion.py [--rapido] [--solo TEXTO] [--guardar-base]
+Devuelve 1 si alguna verificación falla o hay regresiones.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import automatas
+import generators as g
+import semillas
+import tests
+import transformadas
+
+REFERENCIAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "referencias", "secuencias.json")
+BASE = os.path.join(os.path.expanduser("~"), ".calculadora_mz", "bench", "base.json")
+
+# ---------------------- SECUENCIAS DE REFERENCIA ----------------------
+# Implementaciones originales (bucle de Python y recorte de cadena), usadas
+# solo para escribir las referencias: no dependen de los motores optimizados.
+
+def _ref_cuadrados(seed, n):
+    nums, x = [], seed
+    for _ in range(n):
+        mid = int(str(x**2).zfill(8)[2:6])
+        nums.append(mid / 10000.0)
+        x = mid
+    return nums
+
+def _ref_productos(seed1, seed2, n):
+    nums, x, y = [], seed1, seed2
+    for _ in range(n):
+        mid = int(str(x * y).zfill(8)[2:6])
+        nums.append(mid / 10000.0)
+        x, y = y, mid
+    return nums
+
+def _ref_multiplicador(seed, n, a=5, m=10000):
+    nums, x = [], seed
+    for _ in range(n):
+        x = (a * x) % m
+        nums.append(x / float(m))
+    return nums
+
+N_REFERENCIA = 1000
+# (generador, parámetros del constructor, referencia)
+CASOS_REFERENCIA = [
+    ("CuadradosMedios", dict(seed=5735), _ref_cuadrados),
+    ("CuadradosMedios", dict(seed=1234), _ref_cuadrados),
+    ("CuadradosMedios", dict(seed=3792), _ref_cuadrados),  # punto fijo
+    ("CuadradosMedios", dict(seed=12345), _ref_cuadrados),  # semilla de 5 cifras
+    ("ProductosMedios", dict(seed1=5015, seed2=5734), _ref_productos),
+    ("ProductosMedios", dict(seed1=1234, seed2=5678), _ref_productos),
+    ("ProductosMedios", dict(seed1=99999, seed2=12), _ref_productos),
+    ("MultiplicadorConstante", dict(seed=7, a=5), _ref_multiplicador),
+    ("MultiplicadorConstante", dict(seed=12345, a=21), _ref_multiplicador),
+    ("MultiplicadorConstante", dict(seed=12345, a=16807, m=2**31 - 1), _ref_multiplicador),
+    ("MultiplicadorConstante", dict(seed=1, a=48271, m=2**31 - 1), _ref_multiplicador),
+]
+
+def escribir_referencias(ruta=REFERENCIAS):
+    casos = [{"generador": nombre, "parametros": params, "n": N_REFERENCIA,
+              "valores": ref(n=N_REFERENCIA, **params)}
+             for nombre, params, ref in CASOS_REFERENCIA]
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as f:
+        # un caso por línea, para que los diff muestren qué secuencia cambió
+        f.write("[\n" + ",\n".join(json.dumps(caso) for caso in casos) + "\n]\n")
+    return ruta
+
+def verificar_referencias(ruta=REFERENCIAS):
+    """Lista de diferencias (vacía si todo coincide bit a bit)."""
+    with open(ruta, encoding="utf-8") as f:
+        casos = json.load(f)
+    fallas = []
+    for caso in casos:
+        clase = getattr(g, caso["generador"])
+        esperado = np.array(caso["valores"], dtype=float)
+        crear = lambda: clase(n=caso["n"], **caso["parametros"])
+        caminos = {
+            "generar": lambda: crear().generar(),
+            "iter_chunks": lambda: np.concatenate(list(crear().iter_chunks(333))),
+        }
+        if hasattr(clase, "generar_paralelo"):
+            caminos["generar_paralelo"] = lambda: crear().generar_paralelo(workers=3)
+        for camino, f in caminos.items():
+            obtenido = np.asarray(f(), dtype=float)
+            if obtenido.shape != esperado.shape or not np.array_equal(obtenido, esperado):
+                distintos = np.flatnonzero(obtenido != esperado) if obtenido.shape == esperado.shape else []
+                donde = f"primer índice distinto {distintos[0]}" if len(distintos) else "largo distinto"
+                fallas.append(f"{caso['generador']} {caso['parametros']} {camino}: {donde}")
+    return fallas
+
+# (transformada, muestra, ¿debe rechazarse?): una fuente que colapsa a un
+# valor no puede sacar buena calidad aunque ese valor sea el más probable
+CASOS_CALIDAD = [
+    (transformadas.Poisson(3.0), lambda: np.full(5000, 3), True),
+    (transformadas.Poisson(3.0), lambda: np.full(5000, 0), True),
+    (transformadas.Binomial(10, 0.5), lambda: np.full(5000, 5), True),
+    (transformadas.Bernoulli(0.5), lambda: np.ones(5000), True),
+    (transformadas.Alias([0.2, 0.5, 0.3], [10, 20, 30]), lambda: np.full(5000, 20), True),
+    (transformadas.Poisson(3.0), lambda: np.random.default_rng(1).poisson(3.0, 5000), False),
+    (transformadas.Binomial(10, 0.5), lambda: np.random.default_rng(1).binomial(10, 0.5, 5000), False),
+]
+
+def verificar_calidad(alfa=1e-3):
+    """Lista de casos de CASOS_CALIDAD donde el p-valor cae del lado equivocado de alfa."""
+    fallas = []
+    for transformada, muestra, rechazar in CASOS_CALIDAD:
+        p = transformadas.calidad(muestra(), transformada)
+        if not (p < alfa if rechazar else p >= alfa):
+            fallas.append(f"calidad {type(transformada).__name__}: p={p:.3g}"
+                          + (" (debía rechazar)" if rechazar else " (no debía rechazar)"))
+    return fallas
+
+def _recorrido_salidas(paso, estado):
+    """
+    (transitorio, periodo, hasta_cero) de la secuencia de salidas, recorriendo
+    estado a estado: paso(estado) -> (siguiente, valor generado).
+    """
+    visto, salidas = {}, []
+    while estado not in visto:
+        visto[estado] = len(salidas)
+        estado, valor = paso(estado)
+        salidas.append(valor)
+    mu = visto[estado]
+    periodo = len(salidas) - mu
+    for _ in range(periodo):
+        estado, valor = paso(estado)
+        salidas.append(valor)
+    # la secuencia puede volverse periódica antes que el estado
+    while mu > 0 and salidas[mu - 1] == salidas[mu - 1 + periodo]:
+        mu -= 1
+    return mu, periodo, salidas.index(0) if 0 in salidas else -1
+
+def _paso_cuadrados(x):
+    mid = int(str(x**2).zfill(8)[2:6])
+    return mid, mid
+
+def _paso_productos(par):
+    x, y = par
+    mid = int(str(x * y).zfill(8)[2:6])
+    return (y, mid), mid
+
+def verificar_semillas(metodos=("cuadrados",), muestras=500, directorio=None):
+    """
+    Lista de filas de las tablas de semillas que no coinciden con el
+    recorrido: muestras semillas al azar más las mejores de cada tabla.
+    Sin directorio, cuadrados se analiza en una carpeta temporal y
+    productos usa (o construye) la tabla guardada.
+    """
+    fallas = []
+    rng = np.random.default_rng(2024)
+    for metodo in metodos:
+        if directorio is None and metodo == "cuadrados":
+            temporal = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+            tabla = semillas.analizar(metodo, temporal.name)
+        else:
+            tabla = semillas.abrir(metodo, directorio or semillas.DIRECTORIO)
+        estados = np.concatenate([rng.integers(0, len(tabla), muestras),
+                                  tabla.orden[:20], [0, 1, 10000 % len(tabla)]])
+        paso = _paso_productos if metodo == "productos" else _paso_cuadrados
+        for estado in estados.tolist():
+            semilla = tabla.semilla(estado)
+            fila = tabla.fila(semilla)
+            obtenido = (fila["transitorio"], fila["periodo"], fila["hasta_cero"])
+            esperado = _recorrido_salidas(paso, semilla)
+            if obtenido != esperado:
+                fallas.append(f"semillas {metodo} {semilla}: (transitorio, periodo, hasta_cero) "
+                              f"{obtenido} en vez de {esperado}")
+    return fallas
+
+# ---------------------- CASOS DE RENDIMIENTO ----------------------
+def _uniformes(n):
+    return np.random.default_rng(12345).random(n)
+
+def _vida(lado, pasos):
+    inicial = _uniformes(lado * lado).reshape(lado, lado) < 0.2
+    return lambda: automatas.vida_2d(inicial, pasos)
+
+def casos_rendimiento(rapido=False):
+    """
+    Lista de (clave, preparar, unidades): preparar() arma las entradas y
+    devuelve la función a medir; unidades es lo que procesa por llamada
+    (valores o celdas·pasos), para calcular el rendimiento.
+    """
+    tamaños = [10_000, 100_000] if rapido else [10_000, 1_000_000]
+    casos = []
+    for n in tamaños:
+        casos += [
+            (f"generador/Cuadrados Medios/n={n}",
+             lambda n=n: g.CuadradosMedios(5735, n).generar, n),
+            (f"generador/Productos Medios/n={n}",
+             lambda n=n: g.ProductosMedios(5015, 5734, n).generar, n),
+            (f"generador/Multiplicador/n={n}",
+             lambda n=n: g.MultiplicadorConstante(12345, n, a=16807, m=2**31 - 1).generar, n),
+        ]
+        for nombre in ["uniforme_continua", "exponencial", "erlang", "gamma", "normal", "weibull",
+                       "uniforme_discreta", "bernoulli", "binomial", "poisson"]:
+            funcion = getattr(g, "dist_" + nombre)
+            casos.append((f"distribucion/{nombre}/n={n}",
+                          lambda f=funcion, n=n: (lambda: f(n=n, semilla=1)), n))
+        for nombre in ["PruebaMedia", "PruebaVarianza", "PruebaChi2", "PruebaCorridas", "PruebaPoker",
+                       "PruebaHuecos", "PruebaSeries", "PruebaAutocorrelacion", "PruebaKS",
+                       "BateriaAleatoriedad"]:
+            clase = getattr(tests, nombre)
+            casos.append((f"prueba/{nombre}/n={n}",
+                          lambda c=clase, n=n: c(_uniformes(n)).calcular, n))
+
+    # barrido en tamaño de malla y en número de pasos; ambos van en la clave
+    for lado in ([64, 256] if rapido else [128, 1024]):
+        for pasos in ([25, 100] if rapido else [50, 200]):
+            casos += [
+                (f"automata/1d/{lado * 4}x{pasos}",
+                 lambda lado=lado, pasos=pasos: (
+                     lambda: automatas.simular_1d(30, pasos, lado * 4 + 1)),
+                 lado * 4 * pasos),
+                (f"automata/vida/{lado}x{lado}x{pasos}",
+                 lambda lado=lado, pasos=pasos: _vida(lado, pasos), lado * lado * pasos),
+                (f"automata/sir/{lado}x{lado}x{pasos}",
+                 lambda lado=lado, pasos=pasos: (
+                     lambda: automatas.sir_2d(lado, pasos, semilla=1)),
+                 lado * lado * pasos),
+            ]
+    return casos
+
+def medir(preparar, unidades, repeticiones=5):
+    """tiempo (mejor de repeticiones), unidades/s y memoria pico de una llamada."""
+    funcion = preparar()
+    funcion()  # calentamiento (cachés, tablas, importaciones)
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t0)
+    # la memoria se mide aparte: tracemalloc hace más lenta la llamada
+    tracemalloc.start()
+    try:
+        funcion()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    segundos = min(tiempos)
+    return {"segundos": segundos, "por_segundo": unidades / segundos if segundos else None,
+            "memoria_pico": pico, "unidades": unidades}
+
+def correr(rapido=False, solo=None, repeticiones=5, informar=print):
+    resultados = {}
+    for clave, preparar, unidades in casos_rendimiento(rapido):
+        if solo and solo not in clave:
+            continue
+        r = medir(preparar, unidades, repeticiones)
+        resultados[clave] = r
+        informar(f"{clave:<45} {r['segundos'] * 1000:>10.2f} ms {r['por_segundo'] / 1e6:>9.2f} M/s "
+                 f"{r['memoria_pico'] / 1024**2:>9.1f} MB")
+    return {
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "maquina": platform.platform(),
+        "cpus": os.cpu_count(),
+        "rapido": rapido,
+        "resultados": resultados,
+    }
+
+def comparar(actual, base, tolerancia=0.25, margen_tiempo=0.002, margen_memoria=1024**2):
+    """
+    Regresiones de actual frente a base: casos más lentos que base·(1+tolerancia)
+    o con memoria pico mayor en esa proporción. Los márgenes absolutos
+    (segundos, bytes) evitan marcar el ruido de los casos muy cortos.
+    """
+    regresiones = []
+    for clave, r in actual["resultados"].items():
+        b = base["resultados"].get(clave)
+        if b is None:
+            continue
+        if r["segundos"] > b["segundos"] * (1 + tolerancia) \
+                and r["segundos"] - b["segundos"] > margen_tiempo:
+            regresiones.append(f"{clave}: más lento, {b['segundos'] * 1000:.2f} -> {r['segundos'] * 1000:.2f} ms "
+                               f"(x{r['segundos'] / b['segundos']:.2f})")
+        extra = r["memoria_pico"] - b["memoria_pico"]
+        if extra > margen_memoria and r["memoria_pico"] > b["memoria_pico"] * (1 + tolerancia):
+            regresiones.append(f"{clave}: más memoria, {b['memoria_pico'] / 1024**2:.1f} -> "
+                               f"{r['memoria_pico'] / 1024**2:.1f} MB")
+    return regresiones
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendimiento y regresión de la calculadora.")
+    parser.add_argument("--rapido", action="store_true", help="tamaños chicos (para una revisión rápida)")
+    parser.add_argument("--solo", help="solo los casos cuya clave contenga este texto")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", help="archivo JSON para los resultados")
+    parser.add_argument("--base", default=BASE, help=f"base de comparación (por defecto {BASE})")
+    parser.add_argument("--guardar-base", action="store_true", help="guardar estos resultados como base")
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    parser.add_argument("--sin-rendimiento", action="store_true", help="solo verificar las secuencias")
+    parser.add_argument("--semillas", action="store_true",
+                        help="verificar también la tabla de productos medios (la construye si falta)")
+    parser.add_argument("--regenerar-referencias", action="store_true",
+                        help="reescribir referencias/secuencias.json con las implementaciones originales")
+    args = parser.parse_args(argv)
+
+    if args.regenerar_referencias:
+        print(f"Referencias escritas en {escribir_referencias()}")
+    fallas = verificar_referencias()
+    print("Secuencias de referencia: " + ("OK" if not fallas else f"{len(fallas)} diferencias"))
+    for falla in fallas:
+        print("  " + falla)
+    fallas_calidad = verificar_calidad()
+    print("Calidad de transformadas: " + ("OK" if not fallas_calidad else f"{len(fallas_calidad)} fallas"))
+    for falla in fallas_calidad:
+        print("  " + falla)
+    fallas += fallas_calidad
+    fallas_semillas = verificar_semillas(("cuadrados", "productos") if args.semillas else ("cuadrados",))
+    print("Tablas de semillas: " + ("OK" if not fallas_semillas else f"{len(fallas_semillas)} diferencias"))
+    for falla in fallas_semillas[:20]:
+        print("  " + falla)
+    fallas += fallas_semillas
+    if args.sin_rendimiento:
+        return 1 if fallas else 0
+
+    actual = correr(args.rapido, args.solo, args.repeticiones)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(actual, f, indent=2)
+    regresiones = []
+    if args.guardar_base:
+        os.makedirs(os.path.dirname(os.path.abspath(args.base)), exist_ok=True)
+        with open(args.base, "w", encoding="utf-8") as f:
+            json.dump(actual, f, indent=2)
+        print(f"Base guardada en {args.base}")
+    elif os.path.exists(args.base):
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+        regresiones = comparar(actual, base, args.tolerancia)
+        print(f"Comparación con la base del {base['fecha']}: "
+              + ("sin regresiones" if not regresiones else f"{len(regresiones)} regresiones"))
+        for r in regresiones:
+            print("  " + r)
+    return 1 if fallas or regresiones else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
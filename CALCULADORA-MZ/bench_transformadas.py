@@ -0,0 +1,36 @@
+# bench_transformadas.py
+"""
+Mide el camino completo fuente uniforme -> transformada -> variables para
+cada generador y cada distribución de transformadas.TRANSFORMADAS, y el
+p-valor de la salida contra la distribución teórica (KS o Chi²), para ver
+cuánto de la calidad del generador llega a cada distribución. Uso:
+    python bench_transformadas.py [n]
+"""
+import sys
+import time
+
+import generators as g
+import transformadas as t
+
+# (nombre, fábrica de la fuente con cantidad de uniformes)
+FUENTES = [
+    ("Cuadrados medios", lambda cantidad: g.CuadradosMedios(5735, cantidad)),
+    ("Productos medios", lambda cantidad: g.ProductosMedios(5015, 5734, cantidad)),
+    ("Multiplicador", lambda cantidad: g.MultiplicadorConstante(12345, cantidad, a=16807, m=2**31 - 1)),
+    ("NumPy PCG64", lambda cantidad: t.FuenteNumpy(cantidad, semilla=12345)),
+]
+
+def main(n=200_000):
+    print(f"n = {n} variables por caso; M/s incluye generar los uniformes")
+    print(f"{'Fuente':<17} {'Distribución':<18} {'M/s':>7} {'p-valor':>9}")
+    for nombre_fuente, fuente in FUENTES:
+        for nombre, transformada in t.TRANSFORMADAS.items():
+            t0 = time.perf_counter()
+            variables = t.muestrear(fuente(t.uniformes_necesarias(transformada, n)), transformada, n)
+            segundos = time.perf_counter() - t0
+            p = t.calidad(variables, transformada)
+            marca = "  <- rechaza" if p < 0.01 else ""
+            print(f"{nombre_fuente:<17} {nombre:<18} {n / segundos / 1e6:>7.2f} {p:>9.3f}{marca}")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,212 @@
+# cache.py
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from exportar import exportar
+
+DIRECTORIO = os.path.join(os.path.expanduser("~"), ".calculadora_mz", "cache")
+
+
+def _a_json(valor):
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"No se puede guardar en caché: {type(valor).__name__}")
+
+
+class CacheResultados:
+    """
+    Caché direccionada por contenido de corridas ya calculadas: la clave es
+    un hash de (generador, parámetros, semilla, n). Tiene dos niveles:
+      - memoria: LRU de hasta max_memoria entradas (memmap + extras)
+      - disco: <clave>.npy + <clave>.json en directorio; cuando los .npy
+        superan max_bytes se borran los de uso más antiguo. Los .npy
+        enlazados desde el almacén de corridas no cuentan mientras el
+        almacén conserve su copia, porque borrarlos no liberaría nada
+    Junto a cada muestra se guardan "extras" (resultados de pruebas,
+    frecuencias del histograma) con guardar_extra/extra.
+    Es segura para usarse desde los hilos del planificador.
+    """
+    def __init__(self, directorio=DIRECTORIO, max_bytes=2 * 1024**3, max_memoria=16):
+        self.directorio = directorio
+        self.max_bytes = int(max_bytes)
+        self.max_memoria = int(max_memoria)
+        self.memoria = OrderedDict()
+        self.lock = threading.RLock()
+        os.makedirs(self.directorio, exist_ok=True)
+
+    @staticmethod
+    def clave(generador, parametros=None, semilla=None, n=None):
+        contenido = json.dumps(
+            {"generador": generador, "parametros": parametros or {},
+             "semilla": semilla, "n": n},
+            sort_keys=True, default=_a_json)
+        return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+
+    def _ruta(self, clave, ext):
+        return os.path.join(self.directorio, clave + ext)
+
+    def _recordar(self, clave, entrada):
+        self.memoria[clave] = entrada
+        self.memoria.move_to_end(clave)
+        while len(self.memoria) > self.max_memoria:
+            self.memoria.popitem(last=False)
+
+    def _entrada(self, clave):
+        """Entrada {datos, meta} desde memoria o disco; None si no existe."""
+        with self.lock:
+            if not os.path.exists(self._ruta(clave, ".json")):
+                # borrada desde fuera (o nunca guardada)
+                self.memoria.pop(clave, None)
+                return None
+            entrada = self.memoria.get(clave)
+            if entrada is not None:
+                self.memoria.move_to_end(clave)
+            else:
+                with open(self._ruta(clave, ".json"), encoding="utf-8") as f:
+                    meta = json.load(f)
+                datos = None
+                if os.path.exists(self._ruta(clave, ".npy")):
+                    datos = np.load(self._ruta(clave, ".npy"), mmap_mode="r")
+                entrada = {"datos": datos, "meta": meta}
+                self._recordar(clave, entrada)
+            # la fecha de modificación marca el último uso para el desalojo
+            os.utime(self._ruta(clave, ".json"))
+            return entrada
+
+    def obtener(self, clave):
+        """La muestra guardada (np.memmap de solo lectura) o None."""
+        entrada = self._entrada(clave)
+        return None if entrada is None else entrada["datos"]
+
+    def meta(self, clave):
+        entrada = self._entrada(clave)
+        return None if entrada is None else entrada["meta"]
+
+    def guardar(self, clave, datos, meta=None):
+        """
+        Guarda una muestra. Si datos es un memmap de un .npy existente (como
+        los del almacén de corridas) se enlaza el archivo en lugar de copiarlo.
+        Devuelve la muestra abierta como memmap.
+        """
+        ruta = self._ruta(clave, ".npy")
+        origen = getattr(datos, "filename", None)
+        with self.lock:
+            if not self._quitar(clave, ".npy"):
+                # sigue abierto en otro lado (Windows no deja borrarlo); como
+                # la clave es un hash del contenido, se reutiliza el archivo
+                pass
+            elif origen and str(origen).endswith(".npy"):
+                try:
+                    os.link(origen, ruta)
+                except OSError:
+                    shutil.copyfile(origen, ruta)
+            else:
+                exportar(datos, ruta)
+            meta = dict(meta or {}, extras={})
+            self._escribir_meta(clave, meta)
+            entrada = {"datos": np.load(ruta, mmap_mode="r"), "meta": meta}
+            self._recordar(clave, entrada)
+            self._desalojar()
+            return entrada["datos"]
+
+    def _escribir_meta(self, clave, meta):
+        with open(self._ruta(clave, ".json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, default=_a_json)
+
+    def extra(self, clave, nombre):
+        entrada = self._entrada(clave)
+        if entrada is None:
+            return None
+        return entrada["meta"].get("extras", {}).get(nombre)
+
+    def guardar_extra(self, clave, nombre, valor):
+        with self.lock:
+            entrada = self._entrada(clave)
+            if entrada is None:
+                return
+            # pasar por JSON para que memoria y disco devuelvan lo mismo
+            valor = json.loads(json.dumps(valor, default=_a_json))
+            entrada["meta"].setdefault("extras", {})[nombre] = valor
+            self._escribir_meta(clave, entrada["meta"])
+
+    def _quitar(self, clave, ext):
+        """
+        Borra <clave><ext> soltando antes el memmap del nivel de memoria.
+        Devuelve False si el archivo sigue abierto en otro lado y no se pudo borrar.
+        """
+        self.memoria.pop(clave, None)
+        ruta = self._ruta(clave, ext)
+        if not os.path.exists(ruta):
+            return True
+        try:
+            os.remove(ruta)
+        except PermissionError:
+            return False
+        return True
+
+    def _desalojar(self):
+        entradas = sorted(self.inspeccionar()[0], key=lambda e: e["ultimo_uso"])
+        total = sum(e["bytes"] for e in entradas)
+        for e in entradas:
+            if total <= self.max_bytes:
+                break
+            if e["bytes"] and self.borrar(e["clave"]):
+                total -= e["bytes"]
+
+    def inspeccionar(self):
+        """(entradas, bytes totales); cada entrada trae clave, generador, parámetros, n, bytes y último uso."""
+        entradas = []
+        with self.lock:
+            for nombre in os.listdir(self.directorio):
+                if not nombre.endswith(".json"):
+                    continue
+                clave = nombre[:-5]
+                with open(self._ruta(clave, ".json"), encoding="utf-8") as f:
+                    meta = json.load(f)
+                npy = self._ruta(clave, ".npy")
+                info = os.stat(npy) if os.path.exists(npy) else None
+                entradas.append({
+                    "clave": clave,
+                    "generador": meta.get("generador"),
+                    "parametros": meta.get("parametros"),
+                    "n": meta.get("n"),
+                    "extras": sorted(meta.get("extras", {})),
+                    # solo lo que se liberaría al borrarla: un .npy con más
+                    # de un enlace también está en el almacén de corridas
+                    "bytes": info.st_size if info and info.st_nlink == 1 else 0,
+                    "compartido": bool(info and info.st_nlink > 1),
+                    "ultimo_uso": os.path.getmtime(self._ruta(clave, ".json")),
+                })
+        return entradas, sum(e["bytes"] for e in entradas)
+
+    def borrar(self, clave):
+        """Borra una entrada; devuelve False si su .npy sigue abierto y no se pudo borrar."""
+        with self.lock:
+            if not self._quitar(clave, ".npy"):
+                return False
+            return self._quitar(clave, ".json")
+
+    def limpiar(self):
+        for e in self.inspeccionar()[0]:
+            self.borrar(e["clave"])
+
+    def resumen(self):
+        """Texto con el contenido de la caché, para mostrarlo en la GUI."""
+        entradas, total = self.inspeccionar()
+        lineas = [f"Caché: {len(entradas)} entradas, {total / 1024**2:.1f} MB "
+                  f"(máx. {self.max_bytes / 1024**2:.0f} MB)"]
+        for e in sorted(entradas, key=lambda e: e["ultimo_uso"], reverse=True):
+            uso = time.strftime("%Y-%m-%d %H:%M", time.localtime(e["ultimo_uso"]))
+            tam = "en el almacén" if e["compartido"] else f"{e['bytes'] / 1024**2:.1f} MB"
+            lineas.append(f"  {uso}  {e['generador']}  {e['parametros']}  "
+                          f"{tam}  extras={e['extras']}")
+        return "\n".join(lineas)
@@ -0,0 +1,335 @@
+# consola.py
+"""
+Punto de entrada por línea de comandos, sin Tkinter ni matplotlib:
+    python -m consola generar cuadrados --semilla 5735 -n 1000
+    python -m consola probar corrida.npy --prueba bateria
+    python -m consola distribucion poisson --param lam=3 -n 10 --semilla 1
+    python -m consola automata sir --tamaño 200 --pasos 100 --semilla 1
+    python -m consola exportar corrida.npy corrida.parquet
+    python -m consola semillas productos --periodo-min 60 --cuantos 10
+Cada subcomando también acepta su nombre en inglés (generate, test,
+distribution, automaton, export, seeds). Sin --salida los resultados van a stdout,
+un valor por línea. Los módulos se importan dentro de cada subcomando para
+que `generar` solo cargue numpy y generators.
+"""
+import argparse
+import os
+import sys
+
+TAM_SALIDA = 1 << 16  # valores por escritura a stdout
+
+
+def _escribir(datos, salida=None, archivo=sys.stdout):
+    """Escribe datos en el archivo salida (formato según la extensión) o a stdout."""
+    import numpy as np
+    if salida and salida != "-":
+        from exportar import exportar
+        print(exportar(datos, salida), file=sys.stderr)
+        return
+    if isinstance(datos, np.ndarray):
+        # los arreglos enteros (distribuciones discretas) se escriben como enteros
+        bloques = (datos[i:i + TAM_SALIDA] for i in range(0, len(datos), TAM_SALIDA))
+    else:
+        from generators import iter_bloques
+        bloques = iter_bloques(datos, TAM_SALIDA)
+    for bloque in bloques:
+        if len(bloque):
+            archivo.write("\n".join(map(str, bloque.tolist())))
+            archivo.write("\n")
+    archivo.flush()
+
+
+def _leer_entrada(entrada):
+    """Datos de un archivo exportado, de una corrida guardada (por id) o de stdin ("-")."""
+    import numpy as np
+    if entrada == "-":
+        return np.loadtxt(sys.stdin, ndmin=1)
+    if os.path.exists(entrada):
+        from exportar import leer
+        return leer(entrada)
+    from muestras import AlmacenMuestras
+    return AlmacenMuestras().abrir(entrada).datos
+
+
+def _valor(texto):
+    """"3" -> 3, "0.5" -> 0.5, "0.2,0.8" -> [0.2, 0.8]."""
+    if "," in texto:
+        return [_valor(t) for t in texto.split(",")]
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+# ---------------------- SUBCOMANDOS ----------------------
+def cmd_generar(args):
+    from generators import CuadradosMedios, ProductosMedios, MultiplicadorConstante
+    if args.metodo == "cuadrados":
+        gen = CuadradosMedios(seed=args.semilla, n=args.n)
+        nombre, parametros, semilla = "Cuadrados Medios", {"seed": args.semilla, "n": args.n}, args.semilla
+    elif args.metodo == "productos":
+        if args.semilla2 is None:
+            raise ValueError("productos necesita --semilla2.")
+        gen = ProductosMedios(seed1=args.semilla, seed2=args.semilla2, n=args.n)
+        nombre = "Productos Medios"
+        parametros = {"seed1": args.semilla, "seed2": args.semilla2, "n": args.n}
+        semilla = [args.semilla, args.semilla2]
+    else:
+        gen = MultiplicadorConstante(seed=args.semilla, n=args.n, a=args.a, m=args.m)
+        nombre, parametros, semilla = "Multiplicador Constante", {"seed": args.semilla, "n": args.n, "a": args.a}, args.semilla
+        if args.m != 10000:
+            parametros["m"] = args.m
+    if args.guardar:
+        from muestras import AlmacenMuestras
+        corrida = AlmacenMuestras().guardar(gen, nombre, parametros, semilla)
+        print(f"Corrida guardada: {corrida.id}", file=sys.stderr)
+        gen = corrida.datos
+        if not args.salida:
+            return
+    _escribir(gen, args.salida)
+
+
+_PRUEBAS = {
+    "media": "PruebaMedia",
+    "varianza": "PruebaVarianza",
+    "chi2": "PruebaChi2",
+    "uniformidad": "PruebaUniformidad",
+    "corridas": "PruebaCorridas",
+    "poker": "PruebaPoker",
+    "huecos": "PruebaHuecos",
+    "series": "PruebaSeries",
+    "autocorrelacion": "PruebaAutocorrelacion",
+    "ks": "PruebaKS",
+    "bateria": "BateriaAleatoriedad",
+}
+
+
+def cmd_probar(args):
+    import tests
+    datos = _leer_entrada(args.entrada)
+    for nombre in args.prueba or ["bateria"]:
+        print(getattr(tests, _PRUEBAS[nombre])(datos).calcular())
+
+
+_DISTRIBUCIONES = {
+    "uniforme": "dist_uniforme_continua",
+    "exponencial": "dist_exponencial",
+    "erlang": "dist_erlang",
+    "gamma": "dist_gamma",
+    "normal": "dist_normal",
+    "weibull": "dist_weibull",
+    "uniforme-discreta": "dist_uniforme_discreta",
+    "bernoulli": "dist_bernoulli",
+    "binomial": "dist_binomial",
+    "poisson": "dist_poisson",
+    "discreta": "dist_discreta",
+}
+
+
+def cmd_distribucion(args):
+    import generators
+    parametros = {}
+    for par in args.param:
+        clave, sep, valor = par.partition("=")
+        if not sep:
+            raise ValueError(f"Parámetro inválido (se espera nombre=valor): {par}")
+        parametros[clave] = _valor(valor)
+    funcion = getattr(generators, _DISTRIBUCIONES[args.nombre])
+    _escribir(funcion(n=args.n, semilla=args.semilla, **parametros), args.salida)
+
+
+def cmd_automata(args):
+    import numpy as np
+    import automatas
+    if args.tipo == "1d":
+        historia = automatas.simular_1d(args.regla, args.pasos, args.tamaño, args.periodico)
+        matriz = automatas.desempacar_1d(historia, args.tamaño)
+        if args.salida:
+            np.save(args.salida, matriz)
+            print(os.path.abspath(args.salida), file=sys.stderr)
+        else:
+            simbolos = np.array([".", "#"])
+            for fila in matriz:
+                print("".join(simbolos[fila]))
+    elif args.tipo == "vida":
+        inicial = np.random.default_rng(args.semilla).random((args.tamaño, args.tamaño)) < args.densidad
+        ultimo = [inicial]
+
+        def cuadros():
+            print("paso,vivas")
+            print(f"0,{int(inicial.sum())}")
+            yield inicial.astype(np.uint8)
+            for i, malla in enumerate(automatas.iter_vida_2d(inicial, args.pasos, cada=args.cada), 1):
+                print(f"{min(i * args.cada, args.pasos)},{int(malla.sum())}")
+                ultimo[0] = malla
+                yield malla
+        if args.grabar:
+            animacion = automatas.Animacion("Juego de la Vida (2D)", cada=args.cada,
+                                            total=args.pasos)
+            print(animacion.grabar(cuadros(), args.grabar), file=sys.stderr)
+        else:
+            for _ in cuadros():
+                pass
+        if args.salida:
+            np.save(args.salida, ultimo[0].astype(np.uint8))
+            print(os.path.abspath(args.salida), file=sys.stderr)
+    elif args.grabar:
+        # una sola pasada: el motor solo copia los cuadros que se graban y
+        # anota los conteos de todos los pasos en serie
+        serie = np.empty((args.pasos + 1, 3), dtype=np.int64)
+        final = None
+
+        def cuadros():
+            nonlocal final
+            for final in automatas.iter_sir_2d(
+                    args.tamaño, args.pasos, args.densidad, args.p_infeccion,
+                    args.p_recuperacion, args.semilla, args.workers, cada=args.cada,
+                    serie=serie):
+                yield final
+        animacion = automatas.Animacion("Simulación COVID (SIR) - 0:S 1:I 2:R", cmap="viridis",
+                                        niveles=3, vmax=2, cada=args.cada, total=args.pasos,
+                                        reduccion="salto")
+        print(animacion.grabar(cuadros(), args.grabar), file=sys.stderr)
+        print("paso,S,I,R")
+        for i, (s, inf, r) in enumerate(serie.tolist()):
+            print(f"{i},{s},{inf},{r}")
+        if args.salida:
+            np.save(args.salida, final)
+            print(os.path.abspath(args.salida), file=sys.stderr)
+    else:
+        serie, final = automatas.sir_2d(args.tamaño, args.pasos, args.densidad, args.p_infeccion,
+                                        args.p_recuperacion, args.semilla, args.workers)
+        print("paso,S,I,R")
+        for i, (s, inf, r) in enumerate(serie.tolist()):
+            print(f"{i},{s},{inf},{r}")
+        if args.salida:
+            np.save(args.salida, final)
+            print(os.path.abspath(args.salida), file=sys.stderr)
+
+
+def cmd_exportar(args):
+    _escribir(_leer_entrada(args.entrada), args.salida)
+
+
+def cmd_semillas(args):
+    import semillas
+    if args.metodo == "productos" and args.semilla is not None and args.semilla2 is None:
+        raise ValueError("productos necesita --semilla2.")
+    if args.reconstruir:
+        tabla = semillas.analizar(args.metodo, workers=args.workers)
+    else:
+        tabla = semillas.abrir(args.metodo, workers=args.workers)
+    if args.semilla is None:
+        filas = tabla.mejores(args.periodo_min, args.cuantos)
+        print(f"{tabla.contar(args.periodo_min)} semillas con periodo >= {args.periodo_min}",
+              file=sys.stderr)
+    elif args.metodo == "productos":
+        filas = [tabla.fila((args.semilla, args.semilla2))]
+    else:
+        filas = [tabla.fila(args.semilla)]
+    semilla = "seed1,seed2" if args.metodo == "productos" else "semilla"
+    print(f"{semilla},transitorio,periodo,hasta_cero,largo")
+    for f in filas:
+        s = f["semilla"]
+        s = ",".join(map(str, s)) if isinstance(s, tuple) else s
+        print(f"{s},{f['transitorio']},{f['periodo']},{f['hasta_cero']},{f['largo']}")
+
+
+# ---------------------- ARGUMENTOS ----------------------
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m consola",
+        description="Calculadora de números aleatorios por línea de comandos.")
+    parser.add_argument("--tiempos", action="store_true",
+                        help="informar en stderr el tiempo de cada etapa")
+    parser.add_argument("--perfil", action="store_true",
+                        help="con --tiempos, agregar el perfil de cProfile")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("generar", aliases=["generate"], help="generador clásico")
+    p.add_argument("metodo", choices=["cuadrados", "productos", "multiplicador"])
+    p.add_argument("--semilla", type=int, required=True)
+    p.add_argument("--semilla2", type=int, help="segunda semilla (productos)")
+    p.add_argument("-n", type=int, default=1000)
+    p.add_argument("--a", type=int, default=5, help="constante (multiplicador)")
+    p.add_argument("--m", type=int, default=10000, help="módulo (multiplicador)")
+    p.add_argument("--salida", help="archivo .csv/.npy/.bin/.parquet/.feather (por defecto stdout)")
+    p.add_argument("--guardar", action="store_true", help="guardar también en el almacén de corridas")
+    p.set_defaults(funcion=cmd_generar)
+
+    p = sub.add_parser("probar", aliases=["test"], help="pruebas de aleatoriedad")
+    p.add_argument("entrada", help="archivo exportado, id de corrida o - (stdin)")
+    p.add_argument("--prueba", action="append", choices=sorted(_PRUEBAS),
+                   help="se puede repetir (por defecto: bateria)")
+    p.set_defaults(funcion=cmd_probar)
+
+    p = sub.add_parser("distribucion", aliases=["distribution"], help="muestras de una distribución")
+    p.add_argument("nombre", choices=sorted(_DISTRIBUCIONES))
+    p.add_argument("--param", action="append", default=[], metavar="NOMBRE=VALOR",
+                   help="parámetro de dist_* (ej: lam=3, pmf=0.2,0.8)")
+    p.add_argument("-n", type=int, default=1000)
+    p.add_argument("--semilla", type=int)
+    p.add_argument("--salida")
+    p.set_defaults(funcion=cmd_distribucion)
+
+    p = sub.add_parser("automata", aliases=["automaton"], help="autómatas celulares")
+    p.add_argument("tipo", choices=["1d", "vida", "sir"])
+    p.add_argument("--tamaño", "--tamano", dest="tamaño", type=int, default=80)
+    p.add_argument("--pasos", type=int, default=100)
+    p.add_argument("--regla", type=int, default=30, help="regla de Wolfram (1d)")
+    p.add_argument("--periodico", action="store_true", help="bordes envolventes (1d)")
+    p.add_argument("--densidad", type=float, help="densidad inicial (vida: 0.2, sir: 0.02)")
+    p.add_argument("--cada", type=int, default=1,
+                   help="informar cada k pasos (vida) y grabar uno de cada k cuadros")
+    p.add_argument("--p-infeccion", type=float, default=0.3)
+    p.add_argument("--p-recuperacion", type=float, default=0.05)
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--semilla", type=int)
+    p.add_argument("--salida", help="archivo .npy con la malla final (o la historia en 1d)")
+    p.add_argument("--grabar", metavar="RUTA",
+                   help="grabar la animación (vida, sir) en .npz, .gif o .mp4 sin mostrarla")
+    p.set_defaults(funcion=cmd_automata)
+
+    p = sub.add_parser("exportar", aliases=["export"], help="convertir entre formatos")
+    p.add_argument("entrada", help="archivo exportado, id de corrida o - (stdin)")
+    p.add_argument("salida", help="archivo destino (formato según la extensión) o -")
+    p.set_defaults(funcion=cmd_exportar)
+
+    p = sub.add_parser("semillas", aliases=["seeds"], help="análisis exhaustivo de semillas")
+    p.add_argument("metodo", choices=["cuadrados", "productos"])
+    p.add_argument("--periodo-min", type=int, default=1)
+    p.add_argument("--cuantos", type=int, default=10)
+    p.add_argument("--semilla", type=int, help="consultar una semilla en vez de las mejores")
+    p.add_argument("--semilla2", type=int, help="segunda semilla (productos)")
+    p.add_argument("--reconstruir", action="store_true", help="recalcular la tabla guardada")
+    p.add_argument("--workers", type=int, help="procesos para el espacio de pares (por defecto, uno por CPU)")
+    p.set_defaults(funcion=cmd_semillas)
+    return parser
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "densidad", 0) is None:
+        args.densidad = 0.2 if args.tipo == "vida" else 0.02
+    try:
+        if args.tiempos:
+            from rendimiento import MEDIDOR
+            MEDIDOR.perfilar = args.perfil
+            with MEDIDOR.accion(args.comando) as registro:
+                args.funcion(args)
+            print(registro.texto(), file=sys.stderr)
+            if registro.perfil:
+                print(registro.perfil, file=sys.stderr)
+        else:
+            args.funcion(args)
+    except BrokenPipeError:
+        # la salida se cortó (ej: | head); no es un error
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except (ValueError, TypeError, OSError) as e:
+        parser.exit(1, f"Error: {e}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+# exportar.py
+import io
+import os
+import time
+
+import numpy as np
+
+from generators import iter_bloques
+from rendimiento import MEDIDOR, etapa
+
+# Todas las funciones reciben los datos en cualquier forma que acepte
+# iter_bloques (lista, arreglo, generador con iter_chunks o iterable de
+# bloques) y escriben bloque a bloque, sin armar la serie completa en memoria.
+
+def exportar_csv(datos, ruta):
+    """CSV con columnas Índice, Número (mismo formato que csv.writer)."""
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        f.write("Índice,Número\r\n")
+        inicio = 1
+        for bloque in iter_bloques(datos):
+            if len(bloque) == 0:
+                continue
+            indices = range(inicio, inicio + len(bloque))
+            f.write("\r\n".join(map("{},{!r}".format, indices, bloque.tolist())))
+            f.write("\r\n")
+            inicio += len(bloque)
+
+def exportar_binario(datos, ruta):
+    """float64 little-endian sin cabecera (se lee con np.fromfile)."""
+    with open(ruta, "wb") as f:
+        for bloque in iter_bloques(datos):
+            bloque.astype("<f8", copy=False).tofile(f)
+
+def _cabecera_npy(n):
+    buf = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        buf, {"descr": "<f8", "fortran_order": False, "shape": (n,)})
+    return buf.getvalue()
+
+def exportar_npy(datos, ruta):
+    """
+    Archivo .npy de float64. Como el largo puede no conocerse de antemano,
+    se escribe una cabecera provisional y al final se reescribe con el total
+    (ambas ocupan lo mismo porque numpy las rellena a múltiplos de 64 bytes).
+    """
+    with open(ruta, "wb") as f:
+        provisional = _cabecera_npy(0)
+        f.write(provisional)
+        n = 0
+        for bloque in iter_bloques(datos):
+            bloque.astype("<f8", copy=False).tofile(f)
+            n += len(bloque)
+        cabecera = _cabecera_npy(n)
+        if len(cabecera) != len(provisional):
+            raise ValueError("No se pudo reescribir la cabecera .npy.")
+        f.seek(0)
+        f.write(cabecera)
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Para exportar a Parquet o Feather se necesita pyarrow "
+                          "(pip install pyarrow).")
+    return pyarrow
+
+def exportar_parquet(datos, ruta):
+    """Parquet con una columna "Número"; cada bloque es un row group."""
+    pa = _pyarrow()
+    import pyarrow.parquet as pq
+    esquema = pa.schema([("Número", pa.float64())])
+    with pq.ParquetWriter(ruta, esquema) as escritor:
+        for bloque in iter_bloques(datos):
+            escritor.write_table(pa.table({"Número": bloque}, schema=esquema))
+
+def exportar_feather(datos, ruta):
+    """Feather (Arrow IPC) con una columna "Número"; un record batch por bloque."""
+    pa = _pyarrow()
+    esquema = pa.schema([("Número", pa.float64())])
+    with pa.OSFile(ruta, "wb") as f, pa.ipc.new_file(f, esquema) as escritor:
+        for bloque in iter_bloques(datos):
+            escritor.write_batch(pa.record_batch({"Número": bloque}, schema=esquema))
+
+FORMATOS = {
+    ".csv": exportar_csv,
+    ".npy": exportar_npy,
+    ".bin": exportar_binario,
+    ".f64": exportar_binario,
+    ".parquet": exportar_parquet,
+    ".feather": exportar_feather,
+}
+
+def exportar(datos, ruta, progreso=None, cancelar=None):
+    """
+    Exporta según la extensión de ruta (ver FORMATOS). Pensada para correr
+    fuera del hilo de la GUI: informa progreso(escritos, total) por bloque y
+    si cancelar() devuelve True se detiene, borra el archivo a medias y
+    devuelve None. Si termina devuelve la ruta absoluta.
+    """
+    ext = os.path.splitext(ruta)[1].lower()
+    if ext not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {ext or ruta}")
+    total = len(datos) if hasattr(datos, "__len__") else getattr(datos, "n", 0)
+    cancelado = False
+    escritos = 0
+    fuente = 0.0  # tiempo pidiendo bloques a datos (p. ej. generándolos)
+
+    def seguir():
+        nonlocal cancelado, escritos, fuente
+        bloques = iter_bloques(datos)
+        while True:
+            t0 = time.perf_counter()
+            bloque = next(bloques, None)
+            fuente += time.perf_counter() - t0
+            if bloque is None:
+                return
+            if cancelar is not None and cancelar():
+                cancelado = True
+                return
+            yield bloque
+            escritos += len(bloque)
+            if progreso is not None:
+                progreso(escritos, max(total, escritos))
+
+    with etapa(f"exportar {ext}") as medicion:
+        FORMATOS[ext](seguir(), ruta)
+        medicion.unidades = escritos
+        # parte del tiempo anterior que se fue en leer o generar los bloques
+        MEDIDOR.registrar(f"datos de origen ({ext})", fuente, escritos)
+    if cancelado:
+        os.remove(ruta)
+        return None
+    return os.path.abspath(ruta)
+
+# --- Lectura (inversa de FORMATOS) ---
+def leer_csv(ruta):
+    """Columna Número de un CSV escrito por exportar_csv."""
+    return np.loadtxt(ruta, delimiter=",", skiprows=1, usecols=1, encoding="utf-8", ndmin=1)
+
+def leer_binario(ruta):
+    return np.memmap(ruta, dtype="<f8", mode="r")
+
+def leer_npy(ruta):
+    return np.load(ruta, mmap_mode="r")
+
+def leer_parquet(ruta):
+    _pyarrow()
+    import pyarrow.parquet as pq
+    return pq.read_table(ruta).column(0).to_numpy()
+
+def leer_feather(ruta):
+    pa = _pyarrow()
+    with pa.OSFile(ruta, "rb") as f:
+        return pa.ipc.open_file(f).read_all().column(0).to_numpy()
+
+LECTORES = {
+    ".csv": leer_csv,
+    ".npy": leer_npy,
+    ".bin": leer_binario,
+    ".f64": leer_binario,
+    ".parquet": leer_parquet,
+    ".feather": leer_feather,
+}
+
+def leer(ruta):
+    """Lee un archivo exportado según su extensión (ver LECTORES); .npy y binarios como memmap."""
+    ext = os.path.splitext(ruta)[1].lower()
+    if ext not in LECTORES:
+        raise ValueError(f"Formato no soportado: {ext or ruta}")
+    return LECTORES[ext](ruta)
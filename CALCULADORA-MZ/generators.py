@@ -1,9 +1,60 @@
 # generators.py
+from collections import OrderedDict
+import os
+import threading
+
 import numpy as np
-from scipy.stats import uniform, expon, erlang, gamma, norm, weibull_min, bernoulli, binom, poisson
+
+from rendimiento import etapa, medido
 
 # ====== GENERADORES CLÁSICOS ======
 
+TAM_BLOQUE = 65536  # tamaño por defecto de los bloques de iter_chunks
+M_MAXIMO = 3037000499  # mayor módulo con (m-1)² < 2^63
+TAM_VISTA = 1 << 20  # los arreglos grandes se recorren en vistas de este tamaño
+
+def _medio(p):
+    """4 cifras centrales de p rellenado a 8 dígitos (recorte de cadena clásico)."""
+    if 0 <= p < 100000000:
+        return (p // 100) % 10000
+    return int(str(p).zfill(8)[2:6])
+
+def _medio_cuadrado(x):
+    """4 cifras centrales de x² (mismo recorte de cadena que el método clásico)."""
+    return _medio(x * x)
+
+def _validar_bloque(chunk_size):
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size debe ser al menos 1 (se pidió {chunk_size}).")
+
+def _potencias_mod(a, c, m):
+    """
+    Vector [a^0, a^1, ..., a^c] mod m calculado por duplicación:
+    cada paso extiende el bloque ya calculado multiplicándolo por a^len.
+    """
+    pot = np.empty(c + 1, dtype=np.int64)
+    pot[0] = 1 % m
+    lleno, factor = 1, a % m
+    while lleno < c + 1:
+        k = min(lleno, c + 1 - lleno)
+        pot[lleno:lleno + k] = (pot[:k] * factor) % m
+        lleno += k
+        factor = (factor * factor) % m
+    return pot
+
+_SUCESORES_CUADRADOS = None
+
+def tabla_cuadrados_medios():
+    """
+    Tabla de sucesores del método de cuadrados medios: tabla[x] = 4 cifras
+    centrales de x² para los 10^4 estados posibles (se calcula una sola vez).
+    """
+    global _SUCESORES_CUADRADOS
+    if _SUCESORES_CUADRADOS is None:
+        x = np.arange(10000, dtype=np.int64)
+        _SUCESORES_CUADRADOS = (x * x // 100) % 10000
+    return _SUCESORES_CUADRADOS
+
 class CuadradosMedios:
     """
     Método de los cuadrados medios.
@@ -14,16 +65,57 @@ class CuadradosMedios:
         self.seed = int(seed)
         self.n = int(n)
 
+    def _recorrido(self):
+        """
+        Recorre los estados desde la semilla hasta que uno se repite.
+        Devuelve (estados, mu): los estados visitados sin repetir y el índice
+        donde empieza el ciclo (estados[mu:] es el ciclo completo).
+        """
+        tabla = tabla_cuadrados_medios().tolist()
+        visto = {}
+        estados = []
+        x = _medio_cuadrado(self.seed)
+        while x not in visto:
+            visto[x] = len(estados)
+            estados.append(x)
+            x = tabla[x]
+        return np.array(estados, dtype=np.int64), visto[x]
+
+    def ciclo(self):
+        """
+        (transitorio, periodo) de la secuencia generada por la semilla:
+        cuántos valores salen antes de entrar al ciclo y la longitud del ciclo.
+        Sirve para descartar semillas degeneradas sin generar nada.
+        """
+        estados, mu = self._recorrido()
+        return mu, len(estados) - mu
+
+    @medido()
     def generar(self):
-        nums = []
-        x = self.seed
-        for _ in range(self.n):
-            sq = x**2
-            s = str(sq).zfill(8)  # asegurar 8 caracteres
-            mid = int(s[2:6])     # 4 cifras centrales
-            nums.append(mid / 10000.0)
-            x = mid
-        return nums
+        # como el espacio de estados es finito, basta con recorrer hasta cerrar
+        # el ciclo y repetirlo (np.tile, una sola copia de n valores) hasta
+        # completar n valores
+        n = max(self.n, 0)
+        estados, mu = self._recorrido()
+        valores = estados / 10000.0
+        if n <= len(valores):
+            return valores[:n]
+        ciclo = valores[mu:]
+        cola = np.tile(ciclo, -(-(n - mu) // len(ciclo)))[:n - mu]
+        return np.concatenate([valores[:mu], cola])
+
+    def iter_chunks(self, chunk_size=TAM_BLOQUE):
+        """
+        Genera los mismos n valores que generar() en bloques float64 de
+        chunk_size elementos (el último puede ser más corto).
+        """
+        _validar_bloque(chunk_size)
+        estados, mu = self._recorrido()
+        periodo = len(estados) - mu
+        for inicio in range(0, max(self.n, 0), chunk_size):
+            idx = np.arange(inicio, min(inicio + chunk_size, self.n), dtype=np.int64)
+            idx = np.where(idx < mu, idx, mu + (idx - mu) % periodo)
+            yield estados[idx] / 10000.0
 
 class ProductosMedios:
     """
@@ -35,66 +127,344 @@ class ProductosMedios:
         self.y = int(seed2)
         self.n = int(n)
 
+    @medido()
     def generar(self):
-        nums = []
-        for _ in range(self.n):
-            p = self.x * self.y
-            s = str(p).zfill(8)
-            mid = int(s[2:6])
-            nums.append(mid / 10000.0)
-            # rotación de semillas (estilo clásico)
-            self.x, self.y = self.y, mid
-        return nums
+        return _concatenar(self.iter_chunks(max(self.n, 1)))
+
+    def iter_chunks(self, chunk_size=TAM_BLOQUE):
+        """
+        Genera los n valores en bloques float64 de chunk_size elementos.
+        Las semillas rotan al final de cada bloque, igual que en generar().
+        """
+        _validar_bloque(chunk_size)
+        restantes = self.n
+        while restantes > 0:
+            c = min(chunk_size, restantes)
+            mids = []
+            x, y = self.x, self.y
+            for _ in range(c):
+                mid = _medio(x * y)
+                mids.append(mid)
+                # rotación de semillas (estilo clásico)
+                x, y = y, mid
+            self.x, self.y = x, y
+            restantes -= c
+            yield np.array(mids, dtype=np.int64) / 10000.0
 
 class MultiplicadorConstante:
     """
-    Generador congruencial multiplicativo simple (mod 10000)
+    Generador congruencial multiplicativo simple (mod m, por defecto 10000)
     seed: entero
     a: multiplicador
+    m: módulo (a lo más M_MAXIMO para que a·x quepa en int64)
     """
-    def __init__(self, seed: int, n: int, a: int = 5):
+    def __init__(self, seed: int, n: int, a: int = 5, m: int = 10000):
         self.x = int(seed)
         self.n = int(n)
         self.a = int(a)
-        self.m = 10000
+        self.m = int(m)
+        if not 1 <= self.m <= M_MAXIMO:
+            raise ValueError(f"El módulo debe estar entre 1 y {M_MAXIMO}.")
+
+    def jump(self, k):
+        """
+        Avanza la semilla k pasos en O(log k): x_k = a^k · x_0 mod m.
+        Devuelve el nuevo estado.
+        """
+        self.x = (pow(self.a, int(k), self.m) * self.x) % self.m
+        return self.x
 
+    @medido()
     def generar(self):
-        nums = []
-        x = self.x
-        for _ in range(self.n):
-            x = (self.a * x) % self.m
-            nums.append(x / float(self.m))
+        return _concatenar(self.iter_chunks(max(self.n, 1)))
+
+    def iter_chunks(self, chunk_size=TAM_BLOQUE):
+        """
+        Genera los n valores en bloques float64 de chunk_size elementos.
+        Dentro de cada bloque x_{k+i} = a^i · x_k mod m, sin bucle por valor.
+        """
+        _validar_bloque(chunk_size)
+        pot = _potencias_mod(self.a, min(chunk_size, max(self.n, 0)), self.m)
+        x = self.x % self.m
+        restantes = self.n
+        while restantes > 0:
+            c = min(chunk_size, restantes)
+            bloque = (pot[1:c + 1] * x) % self.m
+            x = int(bloque[-1])
+            restantes -= c
+            yield bloque / float(self.m)
+
+    @medido()
+    def generar_paralelo(self, workers=None):
+        """
+        Igual que generar(), pero reparte la secuencia en bloques disjuntos
+        que se calculan en un pool de procesos. Cada bloque arranca con
+        jump() desde la semilla, así que el resultado es idéntico bit a bit.
+        """
+        n = max(self.n, 0)
+        workers = workers or os.cpu_count() or 1
+        nums = np.empty(n, dtype=float)
+        if n == 0:
+            return nums
+        largo = -(-n // workers)
+        inicios = list(range(0, n, largo))
+        args = [(self.x, self.a, self.m, i, min(largo, n - i)) for i in inicios]
+        if len(args) == 1:
+            bloques = [_bloque_multiplicador(*args[0])]
+        else:
+            # se importa aquí: cargar multiprocessing retrasa el arranque de la consola
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=len(args)) as pool:
+                bloques = pool.map(_bloque_multiplicador, *zip(*args))
+        for i, bloque in zip(inicios, bloques):
+            nums[i:i + len(bloque)] = bloque
         return nums
 
+def _bloque_multiplicador(seed, a, m, inicio, largo):
+    """Valores inicio..inicio+largo-1 del multiplicador constante (para el pool)."""
+    x = (pow(a, inicio, m) * seed) % m
+    return (_potencias_mod(a, largo, m)[1:] * x) % m / float(m)
+
+def _concatenar(bloques):
+    """Une los bloques de iter_chunks en un solo arreglo float64."""
+    bloques = list(bloques)
+    if not bloques:
+        return np.empty(0, dtype=float)
+    return np.concatenate(bloques)
+
+def iter_bloques(datos, tam=TAM_VISTA):
+    """
+    Normaliza datos a una secuencia de bloques float64: una lista o arreglo
+    (en vistas de tam elementos), un generador con iter_chunks() o un
+    iterable de bloques.
+    """
+    if hasattr(datos, "iter_chunks"):
+        for bloque in datos.iter_chunks():
+            yield np.asarray(bloque, dtype=float).ravel()
+    elif isinstance(datos, (np.ndarray, list, tuple)):
+        arr = np.asarray(datos, dtype=float).ravel()
+        for i in range(0, arr.size, tam):
+            yield arr[i:i + tam]
+    else:
+        for bloque in datos:
+            yield np.asarray(bloque, dtype=float).ravel()
+
+# ====== DISTRIBUCIONES ======
+# Todas aceptan semilla (entero, SeedSequence o un np.random.Generator ya
+# creado, para compartir un mismo flujo) y out=, un arreglo ya reservado que
+# se llena en su lugar; con out el tamaño es len(out) y se ignora n.
+
+def crear_rng(semilla=None, algoritmo="PCG64"):
+    """np.random.Generator con PCG64 (por defecto) o Philox."""
+    if isinstance(semilla, np.random.Generator):
+        return semilla
+    bits = {"PCG64": np.random.PCG64, "Philox": np.random.Philox}[algoritmo]
+    return np.random.Generator(bits(semilla))
+
+def _salida(n, out, dtype=float):
+    return np.empty(n, dtype=dtype) if out is None else out
+
 # ====== DISTRIBUCIONES CONTINUAS ======
-def dist_uniforme_continua(a=0.0, b=1.0, n=1000):
-    return uniform.rvs(loc=a, scale=b-a, size=n)
+@medido()
+def dist_uniforme_continua(a=0.0, b=1.0, n=1000, semilla=None, out=None):
+    out = _salida(n, out)
+    crear_rng(semilla).random(out=out)
+    out *= b - a
+    out += a
+    return out
 
-def dist_exponencial(lam=1.0, n=1000):
-    return expon.rvs(scale=1.0/lam, size=n)
+@medido()
+def dist_exponencial(lam=1.0, n=1000, semilla=None, out=None):
+    out = _salida(n, out)
+    crear_rng(semilla).standard_exponential(out=out)
+    out /= lam
+    return out
 
-def dist_erlang(k=2, lam=1.0, n=1000):
-    return erlang.rvs(k, scale=1.0/lam, size=n)
+@medido()
+def dist_erlang(k=2, lam=1.0, n=1000, semilla=None, out=None):
+    # Erlang(k, lam) = Gamma con forma entera k
+    return dist_gamma(int(k), lam, n, semilla, out)
 
-def dist_gamma(alpha=2.0, lam=1.0, n=1000):
-    return gamma.rvs(alpha, scale=1.0/lam, size=n)
+@medido()
+def dist_gamma(alpha=2.0, lam=1.0, n=1000, semilla=None, out=None):
+    out = _salida(n, out)
+    crear_rng(semilla).standard_gamma(alpha, out=out)
+    out /= lam
+    return out
 
-def dist_normal(mu=0.0, sigma=1.0, n=1000):
-    return norm.rvs(loc=mu, scale=sigma, size=n)
+@medido()
+def dist_normal(mu=0.0, sigma=1.0, n=1000, semilla=None, out=None):
+    out = _salida(n, out)
+    crear_rng(semilla).standard_normal(out=out)
+    out *= sigma
+    out += mu
+    return out
 
-def dist_weibull(k=1.5, lam=1.0, n=1000):
-    return weibull_min.rvs(c=k, scale=lam, size=n)
+@medido()
+def dist_weibull(k=1.5, lam=1.0, n=1000, semilla=None, out=None):
+    # transformada inversa: lam·(-ln(1-U))^(1/k) = lam·E^(1/k), E ~ Exp(1)
+    out = _salida(n, out)
+    crear_rng(semilla).standard_exponential(out=out)
+    np.power(out, 1.0 / k, out=out)
+    out *= lam
+    return out
 
 # ====== DISTRIBUCIONES DISCRETAS ======
-def dist_uniforme_discreta(a=1, b=6, n=1000):
-    return np.random.randint(a, b + 1, size=n)
+@medido()
+def dist_uniforme_discreta(a=1, b=6, n=1000, semilla=None, out=None):
+    out = _salida(n, out, np.int64)
+    out[...] = crear_rng(semilla).integers(a, b + 1, size=len(out))
+    return out
+
+@medido()
+def dist_bernoulli(p=0.5, n=1000, semilla=None, out=None):
+    out = _salida(n, out, np.int64)
+    out[...] = crear_rng(semilla).random(len(out)) < p
+    return out
+
+@medido()
+def dist_binomial(n_ensayos=10, p=0.5, n=1000, semilla=None, out=None):
+    tabla = tabla_binomial(n_ensayos, p)
+    if tabla is None:
+        out = _salida(n, out, np.int64)
+        out[...] = crear_rng(semilla).binomial(n_ensayos, p, size=len(out))
+        return out
+    return tabla.muestrear(n, semilla, out)
+
+@medido()
+def dist_poisson(lam=3.0, n=1000, semilla=None, out=None):
+    tabla = tabla_poisson(lam)
+    if tabla is None:
+        out = _salida(n, out, np.int64)
+        out[...] = crear_rng(semilla).poisson(lam, size=len(out))
+        return out
+    return tabla.muestrear(n, semilla, out)
+
+@medido()
+def dist_discreta(pmf, valores=None, n=1000, semilla=None, out=None):
+    """Distribución discreta dada por el usuario: P(valores[i]) ∝ pmf[i]."""
+    pmf = np.asarray(pmf, dtype=float)
+    clave = ("discreta", pmf.tobytes(),
+             None if valores is None else np.asarray(valores).tobytes())
+    tabla = _tabla_cacheada(clave, lambda: TablaAlias(pmf, valores))
+    return tabla.muestrear(n, semilla, out)
 
-def dist_bernoulli(p=0.5, n=1000):
-    return bernoulli.rvs(p, size=n)
+# ====== MOTOR DE ALIAS ======
+COLA_TABLAS = 1e-16  # masa de cada cola que se descarta al truncar el soporte
+MAX_TABLA = 1 << 20  # soportes más grandes usan el muestreador de NumPy
+
+def _vose(pmf):
+    """Tablas (prob, alias) de Walker/Vose para una pmf normalizada, en O(K)."""
+    K = len(pmf)
+    q = (pmf * K).tolist()
+    prob = [1.0] * K
+    alias = list(range(K))
+    chicos = [i for i in range(K) if q[i] < 1.0]
+    grandes = [i for i in range(K) if q[i] >= 1.0]
+    while chicos and grandes:
+        s = chicos.pop()
+        l = grandes[-1]
+        prob[s] = q[s]
+        alias[s] = l
+        q[l] -= 1.0 - q[s]
+        if q[l] < 1.0:
+            grandes.pop()
+            chicos.append(l)
+    # lo que queda en cualquiera de las listas vale 1 salvo redondeo
+    return np.array(prob), np.array(alias, dtype=np.int64)
+
+class TablaAlias:
+    """
+    Método de alias de Walker/Vose para una pmf finita. La tabla se arma una
+    vez en O(K) y cada muestra cuesta O(1): con U uniforme se toma la columna
+    i = floor(U·K) y la parte fraccionaria de U·K elige entre i y alias[i].
+    """
+    def __init__(self, pmf, valores=None):
+        pmf = np.asarray(pmf, dtype=float)
+        if pmf.ndim != 1 or pmf.size == 0 or not np.all(np.isfinite(pmf)) \
+                or np.any(pmf < 0) or pmf.sum() <= 0:
+            raise ValueError("La pmf debe ser un vector de pesos no negativos con suma positiva.")
+        if valores is None:
+            valores = np.arange(pmf.size, dtype=np.int64)
+        self.valores = np.asarray(valores)
+        if self.valores.shape != pmf.shape:
+            raise ValueError("valores y pmf deben tener el mismo largo.")
+        self.prob, self.alias = _vose(pmf / pmf.sum())
+        # una columna extra igual a la última cubre U·K == K por redondeo, y
+        # los valores de alias van a continuación: así elegir es una suma y un
+        # solo take en lugar de np.where sobre dos tablas
+        K = len(self.prob)
+        self._prob = np.append(self.prob, self.prob[-1])
+        self._valores = np.concatenate([self.valores, self.valores[-1:],
+                                        self.valores[self.alias],
+                                        self.valores[self.alias[-1:]]])
+        self._salto = K + 1
+
+    def __len__(self):
+        return len(self.prob)
+
+    def desde_uniformes(self, u, moneda=None):
+        """
+        Valores para los uniformes u. Si no se da moneda (segundo uniforme),
+        se usa la parte fraccionaria de u·K, que con float64 sobra para K ≤ 2^20.
+        """
+        x = np.asarray(u, dtype=float) * len(self.prob)
+        i = x.astype(np.int64)
+        if moneda is None:
+            x -= i
+            moneda = x
+        i += (moneda >= self._prob.take(i)) * self._salto
+        return self._valores.take(i)
+
+    def muestrear(self, n=1000, semilla=None, out=None):
+        out = _salida(n, out, self.valores.dtype)
+        rng = crear_rng(semilla)
+        for inicio in range(0, len(out), TAM_VISTA):
+            vista = out[inicio:inicio + TAM_VISTA]
+            vista[...] = self.desde_uniformes(rng.random(len(vista)))
+        return out
+
+_TABLAS_ALIAS = OrderedDict()
+_MAX_TABLAS = 64
+_LOCK_TABLAS = threading.Lock()  # el planificador llama a dist_* desde varios hilos
+
+def _tabla_cacheada(clave, construir):
+    """
+    Devuelve la tabla de clave, armándola con construir() la primera vez
+    (LRU de _MAX_TABLAS). La tabla se arma fuera del lock: si dos hilos
+    piden la misma a la vez, ambos la arman y queda una sola.
+    """
+    with _LOCK_TABLAS:
+        if clave in _TABLAS_ALIAS:
+            _TABLAS_ALIAS.move_to_end(clave)
+            return _TABLAS_ALIAS[clave]
+    with etapa(f"tabla de alias ({clave[0]})"):
+        tabla = construir()
+    with _LOCK_TABLAS:
+        tabla = _TABLAS_ALIAS.setdefault(clave, tabla)
+        _TABLAS_ALIAS.move_to_end(clave)
+        while len(_TABLAS_ALIAS) > _MAX_TABLAS:
+            _TABLAS_ALIAS.popitem(last=False)
+    return tabla
 
-def dist_binomial(n_ensayos=10, p=0.5, n=1000):
-    return binom.rvs(n_ensayos, p, size=n)
+def _tabla_truncada(dist):
+    """Tabla de alias de una distribución de scipy.stats sin las colas < COLA_TABLAS."""
+    inicio, fin = dist.ppf(COLA_TABLAS), dist.isf(COLA_TABLAS) + 1
+    if not (np.isfinite(inicio) and np.isfinite(fin)) or fin - inicio + 1 > MAX_TABLA:
+        return None
+    soporte = np.arange(int(inicio), int(fin) + 1, dtype=np.int64)
+    return TablaAlias(dist.pmf(soporte), soporte)
 
-def dist_poisson(lam=3.0, n=1000):
-    return poisson.rvs(mu=lam, size=n)
+def tabla_binomial(n_ensayos, p):
+    """Tabla de alias (en caché) de Binomial(n_ensayos, p); None si es demasiado grande."""
+    def construir():
+        from scipy import stats
+        return _tabla_truncada(stats.binom(int(n_ensayos), float(p)))
+    return _tabla_cacheada(("binomial", int(n_ensayos), float(p)), construir)
 
+def tabla_poisson(lam):
+    """Tabla de alias (en caché) de Poisson(lam); None si es demasiado grande."""
+    def construir():
+        from scipy import stats
+        return _tabla_truncada(stats.poisson(float(lam)))
+    return _tabla_cacheada(("poisson", float(lam)), construir)
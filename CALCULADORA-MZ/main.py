@@ -1,15 +1,23 @@
 # main.py
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import filedialog, messagebox, ttk
 import numpy as np
 
 from generators import CuadradosMedios, ProductosMedios, MultiplicadorConstante
 from generators import dist_uniforme_continua, dist_exponencial, dist_erlang, dist_gamma, dist_normal, dist_weibull
 from generators import dist_uniforme_discreta, dist_bernoulli, dist_binomial, dist_poisson
 
-from utills import mostrar_histograma, export_csv, exportar_a_excel
-from tests import PruebaMedia, PruebaVarianza, PruebaChi2
-from automatas import automata_1d, automata_2d, simulacion_covid_2d
+from utills import mostrar_histograma, histograma_por_bloques, pedir_ruta_exportacion
+from utills import exportar_a_excel, mostrar_bandas_sir
+from exportar import exportar
+from tests import PruebaMedia, PruebaVarianza, PruebaChi2, PruebaUniformidad, BateriaAleatoriedad
+from automatas import automata_2d, simulacion_covid_2d, ensamble_sir
+from automatas import simular_1d, desempacar_1d, dibujar_1d
+from tareas import PlanificadorTareas
+from muestras import AlmacenMuestras, Corrida
+from cache import CacheResultados
+from transformadas import TRANSFORMADAS, muestrear, calidad
+from rendimiento import MEDIDOR
 
 
 class PRNGDashboard(tk.Tk):
@@ -20,6 +28,18 @@ class PRNGDashboard(tk.Tk):
         self.configure(bg="#B3E5FC")
         self.minsize(900, 600)
         self.numeros = []
+        # cada corrida se guarda en disco y self.numeros es un memmap sobre ella
+        self.almacen = AlmacenMuestras()
+        self.corrida = None
+        # corridas, pruebas e histogramas ya calculados, por (generador, parámetros)
+        self.cache = CacheResultados()
+        self.clave_actual = None
+        # los trabajos pesados corren fuera del hilo de Tk
+        self.tareas = PlanificadorTareas(
+            self, al_actualizar=self.actualizar_estado,
+            al_fallar=lambda clave, e: messagebox.showerror("Error", f"{clave}: {e}"),
+            medidor=MEDIDOR
+        )
 
         tk.Label(
             self,
@@ -55,9 +75,13 @@ class PRNGDashboard(tk.Tk):
             ("Prueba Media", self.test_media),
             ("Prueba Varianza", self.test_varianza),
             ("Prueba Chi²", self.test_chi2),
+            ("Todas las pruebas", self.test_todas),
+            ("Batería completa", self.test_bateria),
             ("Distribuciones", self.ver_distribuciones),
             ("Autómatas", self.ver_automatas),
-            ("Exportar CSV", self.exportar),
+            ("Abrir corrida", self.abrir_corrida),
+            ("Caché", self.ver_cache),
+            ("Exportar", self.exportar),
             ("Limpiar", self.limpiar)
         ]
 
@@ -73,6 +97,101 @@ class PRNGDashboard(tk.Tk):
             )
             b.pack(pady=4, fill="x")
 
+        # barra de estado de los trabajos en segundo plano
+        frame_estado = tk.Frame(self.frame_botones, bg="#B3E5FC")
+        frame_estado.pack(fill="x", pady=6)
+        self.label_estado = tk.Label(frame_estado, text="", bg="#B3E5FC",
+                                     font=("Helvetica", 9), anchor="w")
+        self.label_estado.pack(fill="x")
+        self.barra_estado = ttk.Progressbar(frame_estado, maximum=1.0)
+        self.barra_estado.pack(side="left", fill="x", expand=True)
+        tk.Button(
+            frame_estado, text="Cancelar", bg="#E64A19", fg="white",
+            font=("Helvetica", 9, "bold"), command=self.tareas.cancelar
+        ).pack(side="right", padx=4)
+
+        self.crear_panel_rendimiento()
+
+    # ---------------------- RENDIMIENTO ----------------------
+    def crear_panel_rendimiento(self):
+        """Panel plegable con los tiempos por etapa de cada acción (ver rendimiento.py)."""
+        self.boton_rendimiento = tk.Button(
+            self.frame_botones, text="▸ Rendimiento", anchor="w", bg="#B3E5FC",
+            relief="flat", font=("Helvetica", 10, "bold"), command=self.alternar_rendimiento
+        )
+        self.boton_rendimiento.pack(fill="x")
+        self.panel_rendimiento = tk.Frame(self.frame_botones, bg="#B3E5FC")
+        self.version_rendimiento = None
+
+        opciones = tk.Frame(self.panel_rendimiento, bg="#B3E5FC")
+        opciones.pack(fill="x")
+        self.perfilar = tk.BooleanVar(value=MEDIDOR.perfilar)
+        self.medir_memoria = tk.BooleanVar(value=MEDIDOR.medir_memoria)
+        tk.Checkbutton(opciones, text="cProfile", variable=self.perfilar, bg="#B3E5FC",
+                       command=lambda: setattr(MEDIDOR, "perfilar", self.perfilar.get())
+                       ).pack(side="left")
+        tk.Checkbutton(opciones, text="Memoria", variable=self.medir_memoria, bg="#B3E5FC",
+                       command=lambda: setattr(MEDIDOR, "medir_memoria", self.medir_memoria.get())
+                       ).pack(side="left")
+        for texto, comando in [("Limpiar", self.limpiar_rendimiento),
+                               ("Perfil", self.ver_perfil),
+                               ("JSON", self.exportar_rendimiento)]:
+            tk.Button(opciones, text=texto, font=("Helvetica", 8),
+                      command=comando).pack(side="right", padx=2)
+
+        self.texto_rendimiento = tk.Text(self.panel_rendimiento, height=12, width=45,
+                                         font=("Courier", 8))
+        self.texto_rendimiento.pack(fill="both", expand=True)
+
+    def alternar_rendimiento(self):
+        if self.panel_rendimiento.winfo_ismapped():
+            self.panel_rendimiento.pack_forget()
+            self.boton_rendimiento.configure(text="▸ Rendimiento")
+        else:
+            self.panel_rendimiento.pack(fill="both", expand=True)
+            self.boton_rendimiento.configure(text="▾ Rendimiento")
+            self.refrescar_rendimiento(forzar=True)
+
+    def refrescar_rendimiento(self, forzar=False):
+        if not forzar and (self.version_rendimiento == MEDIDOR.version
+                           or not self.panel_rendimiento.winfo_ismapped()):
+            return
+        self.version_rendimiento = MEDIDOR.version
+        self.texto_rendimiento.delete("1.0", tk.END)
+        self.texto_rendimiento.insert(tk.END, MEDIDOR.texto() or "Sin mediciones todavía.")
+
+    def limpiar_rendimiento(self):
+        MEDIDOR.limpiar()
+        self.refrescar_rendimiento(forzar=True)
+
+    def ver_perfil(self):
+        # los hilos de trabajo agregan registros bajo el lock: se busca en una copia
+        with MEDIDOR.lock:
+            registros = list(MEDIDOR.registros)
+        registro = next((r for r in reversed(registros) if r.perfil), None)
+        if registro is None:
+            messagebox.showinfo("Perfil", "Active cProfile y ejecute una acción.")
+            return
+        win = tk.Toplevel(self)
+        win.title(f"Perfil - {registro.nombre}")
+        win.geometry("900x480")
+        texto = tk.Text(win, font=("Courier", 8), wrap="none")
+        texto.insert(tk.END, registro.perfil)
+        texto.pack(fill="both", expand=True)
+
+    def exportar_rendimiento(self):
+        ruta = filedialog.asksaveasfilename(defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if ruta:
+            MEDIDOR.exportar_json(ruta)
+            self.output_text.insert(tk.END, f"Rendimiento guardado en {ruta}\n")
+
+    def accion_gui(self, nombre, funcion, *args, **kwargs):
+        """Corre en el hilo de Tk (animaciones) una acción medida como las del planificador."""
+        with MEDIDOR.accion(nombre):
+            funcion(*args, **kwargs)
+        self.refrescar_rendimiento()
+
     # ---------------------- PARAMETROS DINÁMICOS ----------------------
     def pedir_parametros(self, campos):
         """Ventana para pedir parámetros de forma dinámica"""
@@ -110,6 +229,55 @@ class PRNGDashboard(tk.Tk):
         win.wait_window()
         return valores
 
+    # ---------------------- TAREAS EN SEGUNDO PLANO ----------------------
+    def actualizar_estado(self, texto, fraccion):
+        self.label_estado.configure(text=texto)
+        if fraccion is None:
+            # sin avance conocido: barra indeterminada
+            if str(self.barra_estado.cget("mode")) != "indeterminate":
+                self.barra_estado.configure(mode="indeterminate")
+                self.barra_estado.start(15)
+        else:
+            self.barra_estado.stop()
+            self.barra_estado.configure(mode="determinate", value=fraccion)
+        self.refrescar_rendimiento()
+
+    def lanzar_generador(self, metodo, gen, parametros, semilla):
+        # el generador escribe por bloques directo al almacén y el histograma
+        # se cuenta en el mismo trabajo, fuera del hilo de Tk; si la misma
+        # corrida ya está en caché no se genera nada
+        clave = self.cache.clave(metodo, parametros, semilla, gen.n)
+
+        def trabajo(progreso, cancelar):
+            datos = self.cache.obtener(clave)
+            if datos is not None:
+                corrida = Corrida(clave, datos, self.cache.meta(clave))
+            else:
+                corrida = self.almacen.guardar(gen, metodo, parametros, semilla,
+                                               progreso, cancelar)
+                if corrida is None:
+                    return None
+                self.cache.guardar(clave, corrida.datos, corrida.meta)
+            return corrida, self.histograma_cacheado(clave, corrida.datos), clave
+
+        self.tareas.lanzar(
+            metodo, trabajo, con_progreso=True,
+            al_terminar=lambda res: res and self.fijar_corrida(*res)
+        )
+
+    def histograma_cacheado(self, clave, datos):
+        hist = self.cache.extra(clave, "histograma")
+        if hist is None:
+            hist = histograma_por_bloques(datos)
+            self.cache.guardar_extra(clave, "histograma", hist)
+        return np.asarray(hist[0]), np.asarray(hist[1])
+
+    def fijar_corrida(self, corrida, hist=None, clave=None):
+        self.corrida = corrida
+        self.clave_actual = clave
+        self.numeros = corrida.datos
+        self.mostrar_resultados(corrida.meta["generador"], hist)
+
     # ---------------------- GENERADORES ----------------------
     def run_cuadrados(self):
         params = self.pedir_parametros(["Semilla (seed)", "Cantidad (n)"])
@@ -117,10 +285,10 @@ class PRNGDashboard(tk.Tk):
             seed = int(params["Semilla (seed)"])
             n = int(params["Cantidad (n)"])
             gen = CuadradosMedios(seed=seed, n=n)
-            self.numeros = gen.generar()
-            self.mostrar_resultados("Cuadrados Medios")
         except Exception as e:
             messagebox.showerror("Error", f"Parámetros inválidos: {e}")
+            return
+        self.lanzar_generador("Cuadrados Medios", gen, {"seed": seed, "n": n}, seed)
 
     def run_productos(self):
         params = self.pedir_parametros(["Semilla 1", "Semilla 2", "Cantidad (n)"])
@@ -129,10 +297,11 @@ class PRNGDashboard(tk.Tk):
             s2 = int(params["Semilla 2"])
             n = int(params["Cantidad (n)"])
             gen = ProductosMedios(seed1=s1, seed2=s2, n=n)
-            self.numeros = gen.generar()
-            self.mostrar_resultados("Productos Medios")
         except Exception as e:
             messagebox.showerror("Error", f"Parámetros inválidos: {e}")
+            return
+        self.lanzar_generador("Productos Medios", gen,
+                              {"seed1": s1, "seed2": s2, "n": n}, [s1, s2])
 
     def run_multiplicador(self):
         params = self.pedir_parametros(["Semilla (seed)", "Cantidad (n)", "Constante (a)"])
@@ -141,51 +310,160 @@ class PRNGDashboard(tk.Tk):
             n = int(params["Cantidad (n)"])
             a = int(params["Constante (a)"])
             gen = MultiplicadorConstante(seed=seed, n=n, a=a)
-            self.numeros = gen.generar()
-            self.mostrar_resultados("Multiplicador Constante")
         except Exception as e:
             messagebox.showerror("Error", f"Parámetros inválidos: {e}")
+            return
+        self.lanzar_generador("Multiplicador Constante", gen,
+                              {"seed": seed, "n": n, "a": a}, seed)
 
     # ---------------------- PRUEBAS ----------------------
-    def test_media(self):
-        if not self.numeros:
+    def lanzar_prueba(self, nombre, prueba, *args):
+        if len(self.numeros) == 0:
             messagebox.showwarning("Aviso", "Genere números primero.")
             return
-        test = PruebaMedia(self.numeros)
-        self.output_text.insert(tk.END, test.calcular() + "\n")
+        numeros, clave = self.numeros, self.clave_actual
+
+        def trabajo():
+            texto = self.cache.extra(clave, nombre) if clave else None
+            if texto is None:
+                texto = prueba(numeros, *args).calcular()
+                if clave:
+                    self.cache.guardar_extra(clave, nombre, texto)
+            return texto
+
+        self.tareas.lanzar(
+            nombre, trabajo,
+            al_terminar=lambda texto: self.output_text.insert(tk.END, texto + "\n")
+        )
+
+    def test_media(self):
+        self.lanzar_prueba("Prueba Media", PruebaMedia)
 
     def test_varianza(self):
-        if not self.numeros:
-            messagebox.showwarning("Aviso", "Genere números primero.")
-            return
-        test = PruebaVarianza(self.numeros)
-        self.output_text.insert(tk.END, test.calcular() + "\n")
+        self.lanzar_prueba("Prueba Varianza", PruebaVarianza)
 
     def test_chi2(self):
-        if not self.numeros:
-            messagebox.showwarning("Aviso", "Genere números primero.")
-            return
-        test = PruebaChi2(self.numeros, k=10)
-        self.output_text.insert(tk.END, test.calcular() + "\n")
+        self.lanzar_prueba("Prueba Chi²", PruebaChi2, 10)
+
+    def test_todas(self):
+        # media, varianza y Chi² en una sola pasada
+        self.lanzar_prueba("Todas las pruebas", PruebaUniformidad, 10)
+
+    def test_bateria(self):
+        # corridas, póker, huecos, series, autocorrelación y KS, con tiempos
+        self.lanzar_prueba("Batería completa", BateriaAleatoriedad, 10)
 
     # ---------------------- RESULTADOS ----------------------
-    def mostrar_resultados(self, metodo):
+    def mostrar_resultados(self, metodo, hist=None):
         self.output_text.delete("1.0", tk.END)
         self.output_text.insert(
             tk.END, f"{metodo}:\n{self.numeros[:50]}...\nTotal: {len(self.numeros)}\n"
         )
-        for w in self.frame_resultados.winfo_children():
-            w.destroy()
-        mostrar_histograma(self.frame_resultados, self.numeros, metodo)
+        frec, bordes = hist if hist is not None else (None, None)
+        mostrar_histograma(self.frame_resultados, self.numeros, metodo,
+                           frec=frec, bordes=bordes)
 
     def exportar(self):
-        if self.numeros:
-            export_csv(self.numeros)
-        else:
+        if len(self.numeros) == 0:
             messagebox.showwarning("Aviso", "No hay números generados para exportar.")
+            return
+        ruta = pedir_ruta_exportacion()
+        if ruta:
+            self.tareas.lanzar(
+                "Exportar", exportar, self.numeros, ruta, con_progreso=True,
+                al_terminar=lambda r: r and self.output_text.insert(tk.END, f"Archivo guardado en {r}\n")
+            )
+
+    def abrir_corrida(self):
+        corridas = self.almacen.listar()
+        if not corridas:
+            messagebox.showinfo("Corridas", "No hay corridas guardadas.")
+            return
+        win = tk.Toplevel(self)
+        win.title("Corridas guardadas")
+        win.geometry("520x360")
+        win.configure(bg="#E1F5FE")
+        lista = tk.Listbox(win, font=("Helvetica", 10))
+        lista.pack(fill="both", expand=True, padx=10, pady=10)
+
+        def rellenar():
+            corridas[:] = self.almacen.listar()
+            lista.delete(0, tk.END)
+            for c in corridas:
+                lista.insert(tk.END, f"{c['fecha']}  {c['generador']}  n={c['n']}  "
+                                     f"{c['parametros']}  {c['bytes'] / 1024**2:.1f} MB")
+        rellenar()
+
+        def abrir():
+            sel = lista.curselection()
+            if not sel:
+                return
+            id = corridas[sel[0]]["id"]
+
+            def trabajo():
+                corrida = self.almacen.abrir(id)
+                m = corrida.meta
+                clave = self.cache.clave(m["generador"], m["parametros"], m["semilla"], m["n"])
+                if self.cache.obtener(clave) is None:
+                    self.cache.guardar(clave, corrida.datos, m)
+                return corrida, self.histograma_cacheado(clave, corrida.datos), clave
+
+            self.tareas.lanzar("Abrir corrida", trabajo,
+                               al_terminar=lambda res: self.fijar_corrida(*res))
+            win.destroy()
+
+        def borrar():
+            sel = lista.curselection()
+            if not sel:
+                return
+            if not self.almacen.borrar(corridas[sel[0]]["id"]):
+                messagebox.showwarning("Corridas", "La corrida está abierta y no se pudo borrar.")
+            rellenar()
+
+        def borrar_todas():
+            if messagebox.askyesno("Corridas", "¿Borrar todas las corridas guardadas?", parent=win):
+                self.almacen.limpiar()
+                rellenar()
+
+        botones = tk.Frame(win, bg="#E1F5FE")
+        botones.pack(pady=8)
+        tk.Button(
+            botones, text="Abrir", bg="#0288D1", fg="white",
+            font=("Helvetica", 11, "bold"), command=abrir
+        ).pack(side="left", padx=4)
+        tk.Button(
+            botones, text="Borrar", bg="#E64A19", fg="white",
+            font=("Helvetica", 11, "bold"), command=borrar
+        ).pack(side="left", padx=4)
+        tk.Button(
+            botones, text="Borrar todas", bg="#E64A19", fg="white",
+            font=("Helvetica", 11, "bold"), command=borrar_todas
+        ).pack(side="left", padx=4)
+
+    def ver_cache(self):
+        win = tk.Toplevel(self)
+        win.title("Caché de resultados")
+        win.geometry("640x360")
+        win.configure(bg="#E1F5FE")
+        texto = tk.Text(win, font=("Helvetica", 9))
+        texto.insert(tk.END, self.cache.resumen())
+        texto.pack(fill="both", expand=True, padx=10, pady=10)
+
+        def vaciar():
+            self.cache.limpiar()
+            self.clave_actual = None
+            texto.delete("1.0", tk.END)
+            texto.insert(tk.END, self.cache.resumen())
+
+        tk.Button(
+            win, text="Vaciar caché", bg="#E64A19", fg="white",
+            font=("Helvetica", 11, "bold"), command=vaciar
+        ).pack(pady=8)
 
     def limpiar(self):
         self.numeros = []
+        self.corrida = None
+        self.clave_actual = None
         self.output_text.delete("1.0", tk.END)
         for widget in self.frame_resultados.winfo_children():
             widget.destroy()
@@ -194,7 +472,7 @@ class PRNGDashboard(tk.Tk):
     def ver_distribuciones(self):
         win = tk.Toplevel(self)
         win.title("Distribuciones estadísticas")
-        win.geometry("420x520")
+        win.geometry("420x600")
         win.configure(bg="#E1F5FE")
 
         opciones = [
@@ -228,20 +506,82 @@ class PRNGDashboard(tk.Tk):
         self.entry_n_dist = tk.Entry(framep, width=8)
         self.entry_n_dist.insert(0, "1000")
         self.entry_n_dist.grid(row=0, column=1, padx=6)
+        # con semilla la muestra es reproducible y se guarda en caché
+        tk.Label(framep, text="Semilla:", bg="#E1F5FE").grid(row=0, column=2)
+        self.entry_semilla_dist = tk.Entry(framep, width=8)
+        self.entry_semilla_dist.grid(row=0, column=3, padx=6)
+        # exportar a Excel es lento y limitado a ~10^6 filas: solo si se pide
+        self.excel_dist = tk.BooleanVar(value=False)
+        tk.Checkbutton(framep, text="Exportar a Excel", variable=self.excel_dist,
+                       bg="#E1F5FE").grid(row=1, column=0, columnspan=4, pady=4)
+        # usa los números del generador actual como fuente uniforme
+        self.fuente_dist = tk.BooleanVar(value=False)
+        tk.Checkbutton(framep, text="Transformar los números generados",
+                       variable=self.fuente_dist,
+                       bg="#E1F5FE").grid(row=2, column=0, columnspan=4, pady=4)
 
     def mostrar_distribucion(self, funcion, nombre, ventana):
         n = int(self.entry_n_dist.get() or 1000)
-        datos = funcion(n=n)
-        datos = np.asarray(datos).flatten()
-        mostrar_histograma(self.frame_resultados, datos, nombre)
-        exportar_a_excel(datos, f"{nombre.replace(' ', '_')}.xlsx")
-        messagebox.showinfo("Éxito", f"{nombre} generada y exportada correctamente.")
+        texto_semilla = self.entry_semilla_dist.get().strip()
+        semilla = int(texto_semilla) if texto_semilla else None
+        a_excel = self.excel_dist.get()
+        if self.fuente_dist.get():
+            self.transformar_numeros(nombre, n, a_excel)
+            return
+
+        def trabajo():
+            if semilla is None:
+                datos = funcion(n=n)
+                hist = histograma_por_bloques(datos)
+            else:
+                clave = self.cache.clave(nombre, {"n": n}, semilla, n)
+                datos = self.cache.obtener(clave)
+                if datos is None:
+                    datos = self.cache.guardar(
+                        clave, funcion(n=n, semilla=semilla),
+                        {"generador": nombre, "parametros": {"n": n},
+                         "semilla": semilla, "n": n})
+                hist = self.histograma_cacheado(clave, datos)
+            if a_excel:
+                exportar_a_excel(datos, f"{nombre.replace(' ', '_')}.xlsx")
+            return hist
+
+        def listo(hist):
+            mostrar_histograma(self.frame_resultados, None, nombre,
+                               frec=hist[0], bordes=hist[1])
+            if a_excel:
+                messagebox.showinfo("Éxito", f"{nombre} generada y exportada correctamente.")
+
+        self.tareas.lanzar(nombre, trabajo, al_terminar=listo)
+
+    def transformar_numeros(self, nombre, n, a_excel):
+        if not len(self.numeros):
+            messagebox.showwarning("Advertencia", "Primero genera números.")
+            return
+        transformada = TRANSFORMADAS[nombre]
+        numeros = self.numeros
+
+        def trabajo():
+            datos = muestrear(numeros, transformada, n)
+            if a_excel:
+                exportar_a_excel(datos, f"{nombre.replace(' ', '_')}.xlsx")
+            return len(datos), calidad(datos, transformada), histograma_por_bloques(datos)
+
+        def listo(resultado):
+            cantidad, p, hist = resultado
+            self.output_text.insert(
+                tk.END, f"{nombre} desde los números generados: {cantidad} valores, "
+                        f"p-valor contra la distribución teórica = {p:.4f}\n")
+            mostrar_histograma(self.frame_resultados, None, f"{nombre} (transformada)",
+                               frec=hist[0], bordes=hist[1])
+
+        self.tareas.lanzar(f"{nombre} (transformada)", trabajo, al_terminar=listo)
 
     # ---------------------- AUTOMATAS ----------------------
     def ver_automatas(self):
         win = tk.Toplevel(self)
         win.title("Autómatas Celulares")
-        win.geometry("380x340")
+        win.geometry("380x440")
         win.configure(bg="#E1F5FE")
 
         tk.Label(
@@ -249,12 +589,17 @@ class PRNGDashboard(tk.Tk):
             bg="#E1F5FE", font=("Helvetica", 12, "bold")
         ).pack(pady=8)
 
+        grabar = tk.BooleanVar(value=False)
+
         opciones = [
-            ("Autómata 1D (Regla 110)", lambda: automata_1d(regla=110, pasos=150, tamaño=301)),
-            ("Autómata 1D (Regla 30)", lambda: automata_1d(regla=30, pasos=150, tamaño=301)),
-            ("Autómata 2D (Juego de la Vida)", lambda: automata_2d(tamaño=80, pasos=200, densidad=0.2)),
-            ("Simulación COVID 2D (SIR)", lambda: simulacion_covid_2d(
-                tamaño=80, pasos=200, densidad_inicial=0.02, p_infeccion=0.25, p_recuperacion=0.03))
+            ("Autómata 1D (Regla 110)", lambda: self.run_automata_1d(regla=110, pasos=150, tamaño=301)),
+            ("Autómata 1D (Regla 30)", lambda: self.run_automata_1d(regla=30, pasos=150, tamaño=301)),
+            ("Autómata 2D (Juego de la Vida)", lambda: self.run_automata_2d(
+                "Juego de la Vida", automata_2d, grabar.get(), tamaño=80, pasos=200, densidad=0.2)),
+            ("Simulación COVID 2D (SIR)", lambda: self.run_automata_2d(
+                "Simulación COVID 2D", simulacion_covid_2d, grabar.get(), tamaño=80, pasos=200,
+                densidad_inicial=0.02, p_infeccion=0.25, p_recuperacion=0.03)),
+            ("Ensamble SIR (Monte Carlo)", self.run_ensamble_sir)
         ]
 
         for nombre, func in opciones:
@@ -265,6 +610,61 @@ class PRNGDashboard(tk.Tk):
                 width=30, command=func
             ).pack(pady=6)
 
+        tk.Checkbutton(
+            win, text="Grabar las animaciones 2D en archivo (sin mostrar)",
+            variable=grabar, bg="#E1F5FE"
+        ).pack(pady=4)
+
+    def run_automata_2d(self, nombre, funcion, grabar, **kwargs):
+        if not grabar:
+            self.accion_gui(nombre, funcion, **kwargs)
+            return
+        ruta = filedialog.asksaveasfilename(
+            defaultextension=".npz",
+            filetypes=[("Cuadros comprimidos", "*.npz"), ("GIF", "*.gif"), ("Video", "*.mp4")])
+        if not ruta:
+            return
+        # sin ventana no hace falta el hilo de Tk: se graba en segundo plano
+        self.tareas.lanzar(
+            f"{nombre} (grabación)", funcion, grabar=ruta, **kwargs,
+            al_terminar=lambda r: self.output_text.insert(tk.END, f"Animación guardada en {r}\n")
+        )
+
+    def run_automata_1d(self, regla, pasos, tamaño):
+        # se simula en segundo plano; el dibujo queda en el hilo de Tk
+        self.tareas.lanzar(
+            f"Autómata 1D (Regla {regla})", simular_1d, regla, pasos, tamaño,
+            al_terminar=lambda h: dibujar_1d(desempacar_1d(h, tamaño), regla)
+        )
+
+    def run_ensamble_sir(self):
+        params = self.pedir_parametros([
+            "p_infeccion (ej: 0.2, 0.3)", "p_recuperacion (ej: 0.03)",
+            "Réplicas", "Tamaño", "Pasos"
+        ])
+        try:
+            p_inf = [float(v) for v in params["p_infeccion (ej: 0.2, 0.3)"].split(",")]
+            p_rec = [float(v) for v in params["p_recuperacion (ej: 0.03)"].split(",")]
+            replicas = int(params["Réplicas"])
+            tamaño = int(params["Tamaño"])
+            pasos = int(params["Pasos"])
+        except Exception as e:
+            messagebox.showerror("Error", f"Parámetros inválidos: {e}")
+            return
+        self.tareas.lanzar(
+            "Ensamble SIR", ensamble_sir, p_inf, p_rec, replicas=replicas,
+            tamaño=tamaño, pasos=pasos, con_progreso=True,
+            al_terminar=lambda res: res is not None and self.mostrar_ensamble(res)
+        )
+
+    def mostrar_ensamble(self, res):
+        self.output_text.insert(tk.END, "Ensamble SIR - paso del pico de infectados (media):\n")
+        for i, p_inf in enumerate(res["p_infeccion"]):
+            for j, p_rec in enumerate(res["p_recuperacion"]):
+                self.output_text.insert(
+                    tk.END, f"  p_inf={p_inf:g}, p_rec={p_rec:g}: {res['pico'][i, j].mean():.1f}\n")
+        mostrar_bandas_sir(self.frame_resultados, res)
+
 
 if __name__ == "__main__":
     app = PRNGDashboard()
@@ -0,0 +1,122 @@
+# muestras.py
+from datetime import datetime
+import json
+import os
+import time
+import uuid
+
+import numpy as np
+
+from exportar import exportar
+
+DIRECTORIO = os.path.join(os.path.expanduser("~"), ".calculadora_mz", "corridas")
+
+
+class Corrida:
+    """
+    Una corrida guardada: datos es un np.memmap de solo lectura sobre el
+    .npy, así que pruebas, histogramas y exportación leen vistas del
+    archivo sin cargarlo en RAM.
+    """
+    def __init__(self, id, datos, meta):
+        self.id = id
+        self.datos = datos
+        self.meta = meta
+
+    def __len__(self):
+        return len(self.datos)
+
+    def iter_chunks(self, chunk_size=1 << 20):
+        for i in range(0, len(self.datos), chunk_size):
+            yield self.datos[i:i + chunk_size]
+
+
+class AlmacenMuestras:
+    """
+    Guarda cada corrida como <id>.npy (float64) más <id>.json con sus
+    metadatos: generador, parámetros, semilla, n y fecha.
+    max_corridas, max_bytes: al guardar una corrida se borran las más
+        antiguas hasta quedar dentro de ambos límites (la nueva siempre queda)
+    """
+    def __init__(self, directorio=DIRECTORIO, max_corridas=20, max_bytes=4 * 1024**3):
+        self.directorio = directorio
+        self.max_corridas = int(max_corridas)
+        self.max_bytes = int(max_bytes)
+        os.makedirs(self.directorio, exist_ok=True)
+
+    def _ruta(self, id, ext):
+        return os.path.join(self.directorio, id + ext)
+
+    def guardar(self, datos, generador, parametros=None, semilla=None,
+                progreso=None, cancelar=None):
+        """
+        Escribe datos (lista, arreglo, generador con iter_chunks o iterable
+        de bloques) bloque a bloque y devuelve la Corrida ya abierta, o None
+        si se canceló.
+        """
+        # los ids ordenan cronológicamente (con microsegundos): el recorte usa ese orden
+        id = datetime.now().strftime("%Y%m%d-%H%M%S-%f-") + uuid.uuid4().hex[:6]
+        if exportar(datos, self._ruta(id, ".npy"), progreso, cancelar) is None:
+            return None
+        corrida = self._abrir_datos(id)
+        meta = {
+            "generador": generador,
+            "parametros": parametros or {},
+            "semilla": semilla,
+            "n": len(corrida),
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with open(self._ruta(id, ".json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        corrida.meta = meta
+        self._recortar(conservar=id)
+        return corrida
+
+    def _recortar(self, conservar=None):
+        corridas = self.listar()
+        total = sum(c["bytes"] for c in corridas)
+        # de la más antigua a la más reciente
+        for i, c in reversed(list(enumerate(corridas))):
+            if i < self.max_corridas and total <= self.max_bytes:
+                break
+            if c["id"] != conservar and self.borrar(c["id"]):
+                total -= c["bytes"]
+
+    def _abrir_datos(self, id):
+        return Corrida(id, np.load(self._ruta(id, ".npy"), mmap_mode="r"), {})
+
+    def abrir(self, id):
+        corrida = self._abrir_datos(id)
+        with open(self._ruta(id, ".json"), encoding="utf-8") as f:
+            corrida.meta = json.load(f)
+        return corrida
+
+    def listar(self):
+        """
+        Metadatos de las corridas guardadas, de la más reciente a la más
+        antigua, con su id y el tamaño del .npy en bytes.
+        """
+        corridas = []
+        for nombre in sorted(os.listdir(self.directorio), reverse=True):
+            if nombre.endswith(".json"):
+                id = nombre[:-5]
+                with open(os.path.join(self.directorio, nombre), encoding="utf-8") as f:
+                    meta = json.load(f)
+                npy = self._ruta(id, ".npy")
+                tam = os.path.getsize(npy) if os.path.exists(npy) else 0
+                corridas.append(dict(meta, id=id, bytes=tam))
+        return corridas
+
+    def borrar(self, id):
+        """Borra una corrida; devuelve False si su .npy sigue abierto (Windows) y no se pudo borrar."""
+        for ext in (".npy", ".json"):
+            if os.path.exists(self._ruta(id, ext)):
+                try:
+                    os.remove(self._ruta(id, ext))
+                except PermissionError:
+                    return False
+        return True
+
+    def limpiar(self):
+        """Borra todas las corridas que no estén abiertas; devuelve cuántas borró."""
+        return sum(self.borrar(c["id"]) for c in self.listar())
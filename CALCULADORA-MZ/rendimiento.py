@@ -0,0 +1,281 @@
+# rendimiento.py
+import cProfile
+from collections import deque
+from contextlib import contextmanager
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+
+# Instrumentación de los caminos pesados: cada acción del dashboard (un
+# trabajo del planificador) abre un Registro y las funciones marcadas con
+# @medido o `with etapa(...)` le agregan sus tiempos. Fuera de una acción
+# solo se acumulan los contadores globales. No importa nada pesado, así que
+# generators, tests y exportar lo usan sin costo de arranque.
+
+
+class Etapa:
+    """Tiempo y unidades procesadas (valores, celdas...) de un tramo medido."""
+    __slots__ = ("nombre", "segundos", "unidades", "profundidad")
+
+    def __init__(self, nombre, unidades=None, profundidad=0):
+        self.nombre = nombre
+        self.segundos = 0.0
+        self.unidades = unidades
+        self.profundidad = profundidad
+
+    def por_segundo(self):
+        if self.unidades is None or self.segundos <= 0:
+            return None
+        return self.unidades / self.segundos
+
+    def a_dict(self):
+        return {"nombre": self.nombre, "segundos": self.segundos, "unidades": self.unidades,
+                "por_segundo": self.por_segundo(), "profundidad": self.profundidad}
+
+
+class Registro:
+    """Una acción completa: sus etapas en orden, duración total, memoria pico y perfil."""
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.fecha = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.inicio = time.perf_counter()
+        self.segundos = 0.0
+        self.etapas = []
+        self.memoria_pico = None  # bytes (tracemalloc), solo si se pidió
+        self.perfil = None        # texto de pstats, solo si se pidió
+        self.error = None
+        self.profundidad = 0
+
+    def a_dict(self):
+        return {"nombre": self.nombre, "fecha": self.fecha, "segundos": self.segundos,
+                "memoria_pico": self.memoria_pico, "error": self.error,
+                "etapas": [e.a_dict() for e in self.etapas], "perfil": self.perfil}
+
+    def texto(self):
+        lineas = [f"{self.fecha}  {self.nombre}: {self.segundos * 1000:.1f} ms"
+                  + (f", memoria pico {self.memoria_pico / 1024**2:.1f} MB"
+                     if self.memoria_pico is not None else "")
+                  + (f"  [error: {self.error}]" if self.error else "")]
+        for e in self.etapas:
+            ritmo = e.por_segundo()
+            lineas.append(f"  {'  ' * e.profundidad}{e.nombre}: {e.segundos * 1000:.1f} ms"
+                          + (f", {ritmo / 1e6:.2f} M/s" if ritmo else ""))
+        return "\n".join(lineas)
+
+
+def _largo(x):
+    try:
+        return len(x)
+    except TypeError:
+        return getattr(x, "n", None)
+
+
+def largo_resultado(resultado, *args, **kwargs):
+    """Unidades por defecto de @medido: el largo de lo que devuelve la función."""
+    return _largo(resultado)
+
+
+def largo_numeros(resultado, objeto, *args, **kwargs):
+    """Unidades de los métodos que procesan objeto.numeros (las pruebas)."""
+    return _largo(objeto.numeros)
+
+
+class Medidor:
+    """
+    Registro de tiempos por acción y contadores globales por etapa.
+    perfilar: captura cProfile de cada acción (solo el hilo que la ejecuta)
+    medir_memoria: memoria pico de cada acción con tracemalloc; es global
+        al proceso, así que con dos acciones a la vez los picos se mezclan
+    Es seguro usarlo desde los hilos del planificador.
+    """
+    def __init__(self, max_registros=50):
+        self.activo = True
+        self.perfilar = False
+        self.medir_memoria = False
+        self.registros = deque(maxlen=max_registros)
+        self.contadores = {}
+        self.version = 0  # cambia con cada registro terminado (para refrescar la GUI)
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    def actual(self):
+        """Registro de la acción que corre en este hilo (o None)."""
+        return getattr(self._local, "registro", None)
+
+    # ---------------------- etapas ----------------------
+    def _contar(self, etapa):
+        with self.lock:
+            c = self.contadores.setdefault(etapa.nombre, {"llamadas": 0, "segundos": 0.0, "unidades": 0})
+            c["llamadas"] += 1
+            c["segundos"] += etapa.segundos
+            if etapa.unidades is not None:
+                c["unidades"] += etapa.unidades
+
+    @contextmanager
+    def etapa(self, nombre, unidades=None):
+        """
+        Mide el bloque with. Devuelve la Etapa, así el código puede fijar
+        etapa.unidades al final si no las conoce de antemano.
+        """
+        registro = self.actual()
+        etapa = Etapa(nombre, unidades, registro.profundidad if registro else 0)
+        if not self.activo:
+            yield etapa
+            return
+        if registro is not None:
+            registro.etapas.append(etapa)
+            registro.profundidad += 1
+        t0 = time.perf_counter()
+        try:
+            yield etapa
+        finally:
+            etapa.segundos = time.perf_counter() - t0
+            if registro is not None:
+                registro.profundidad -= 1
+            self._contar(etapa)
+
+    def registrar(self, nombre, segundos, unidades=None):
+        """Agrega una etapa ya medida (p. ej. tiempo acumulado entre bloques)."""
+        if not self.activo:
+            return
+        registro = self.actual()
+        etapa = Etapa(nombre, unidades, registro.profundidad if registro else 0)
+        etapa.segundos = segundos
+        if registro is not None:
+            registro.etapas.append(etapa)
+        self._contar(etapa)
+
+    def medido(self, nombre=None, unidades=largo_resultado):
+        """
+        Decorador: mide cada llamada como una etapa. Sin nombre, los métodos
+        usan Clase.método (de la instancia, no de la clase base).
+        unidades(resultado, *args, **kwargs) da las unidades procesadas.
+        """
+        def decorador(funcion):
+            @functools.wraps(funcion)
+            def envoltura(*args, **kwargs):
+                if not self.activo:
+                    return funcion(*args, **kwargs)
+                etiqueta = nombre
+                if etiqueta is None:
+                    etiqueta = funcion.__name__
+                    if "." in funcion.__qualname__ and args:
+                        etiqueta = f"{type(args[0]).__name__}.{funcion.__name__}"
+                with self.etapa(etiqueta) as etapa:
+                    resultado = funcion(*args, **kwargs)
+                    if unidades is not None:
+                        try:
+                            etapa.unidades = unidades(resultado, *args, **kwargs)
+                        except Exception:
+                            etapa.unidades = None
+                return resultado
+            return envoltura
+        return decorador
+
+    # ---------------------- acciones ----------------------
+    def nuevo_registro(self, nombre):
+        registro = Registro(nombre)
+        with self.lock:
+            self.registros.append(registro)
+        return registro
+
+    @contextmanager
+    def en(self, registro, nombre=None):
+        """Hace de registro la acción actual de este hilo (y mide el bloque como etapa nombre)."""
+        anterior = self.actual()
+        self._local.registro = registro
+        try:
+            if nombre is None:
+                yield registro
+            else:
+                with self.etapa(nombre):
+                    yield registro
+        finally:
+            self._local.registro = anterior
+            registro.segundos = time.perf_counter() - registro.inicio
+            with self.lock:
+                self.version += 1
+
+    @contextmanager
+    def _midiendo(self, registro):
+        """Bloque de una acción, con cProfile y tracemalloc si están activados."""
+        perfil = cProfile.Profile() if self.perfilar else None
+        memoria = self.medir_memoria
+        propio = memoria and not tracemalloc.is_tracing()
+        if propio:
+            tracemalloc.start()
+        elif memoria:
+            tracemalloc.reset_peak()
+        try:
+            with self.en(registro):
+                if perfil is not None:
+                    try:
+                        perfil.enable()
+                    except ValueError:
+                        perfil = None  # ya hay otro perfilador activo
+                try:
+                    yield registro
+                except Exception as e:
+                    registro.error = str(e)
+                    raise
+                finally:
+                    if perfil is not None:
+                        perfil.disable()
+        finally:
+            if memoria:
+                registro.memoria_pico = tracemalloc.get_traced_memory()[1]
+                if propio:
+                    tracemalloc.stop()
+            if perfil is not None:
+                salida = io.StringIO()
+                pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(25)
+                registro.perfil = salida.getvalue()
+
+    def ejecutar(self, registro, funcion, *args, **kwargs):
+        """Corre funcion como la acción registro (lo usa el planificador en sus hilos)."""
+        with self._midiendo(registro):
+            return funcion(*args, **kwargs)
+
+    def accion(self, nombre):
+        """Acción fuera del planificador (consola, scripts): with accion("..."): ..."""
+        return self._midiendo(self.nuevo_registro(nombre))
+
+    # ---------------------- consulta ----------------------
+    def a_dict(self):
+        with self.lock:
+            return {"registros": [r.a_dict() for r in self.registros],
+                    "contadores": {k: dict(v) for k, v in self.contadores.items()}}
+
+    def exportar_json(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.a_dict(), f, ensure_ascii=False, indent=2)
+        return ruta
+
+    def texto(self, ultimos=10):
+        """Resumen legible: últimas acciones con sus etapas y los contadores globales."""
+        with self.lock:
+            registros = list(self.registros)[-ultimos:]
+            contadores = sorted(self.contadores.items(), key=lambda kv: -kv[1]["segundos"])
+        partes = [r.texto() for r in reversed(registros)]
+        if contadores:
+            partes.append("Totales por etapa:")
+            for nombre, c in contadores:
+                ritmo = c["unidades"] / c["segundos"] if c["unidades"] and c["segundos"] else None
+                partes.append(f"  {nombre}: {c['llamadas']} llamadas, {c['segundos'] * 1000:.1f} ms"
+                              + (f", {ritmo / 1e6:.2f} M/s" if ritmo else ""))
+        return "\n".join(partes)
+
+    def limpiar(self):
+        with self.lock:
+            self.registros.clear()
+            self.contadores.clear()
+            self.version += 1
+
+
+MEDIDOR = Medidor()
+etapa = MEDIDOR.etapa
+medido = MEDIDOR.medido
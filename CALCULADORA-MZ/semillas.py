@@ -0,0 +1,329 @@
+# semillas.py
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from generators import TAM_VISTA, tabla_cuadrados_medios
+from rendimiento import etapa
+
+# Análisis exhaustivo del espacio de semillas de los métodos de medios. Cada
+# método es una función f sobre un espacio finito de estados (10^4 valores en
+# cuadrados medios, 10^8 pares (x, y) en productos medios), así que todas las
+# semillas se analizan a la vez sobre el arreglo de sucesores por duplicación
+# de punteros: en cada ronda todos los estados saltan 2^k pasos, y en
+# O(log(transitorio máximo)) rondas se conoce el ciclo al que cae cada semilla
+# y a qué distancia. El resultado se guarda como tabla indexada en disco
+# (columnas .npy + un orden por periodo) para consultar las mejores semillas
+# sin recalcular.
+
+DIRECTORIO = os.path.join(os.path.expanduser("~"), ".calculadora_mz", "semillas")
+COLUMNAS = ("transitorio", "periodo", "hasta_cero")
+VERSION = 2  # sube cuando cambia el contenido de las tablas (las viejas se recalculan)
+
+
+def _sucesores_cuadrados(T, inicio, fin):
+    T[inicio:fin] = tabla_cuadrados_medios()[inicio:fin]
+
+
+def _sucesores_productos(T, inicio, fin):
+    """Estado i = x·10^4 + y  ->  (y, medio(x·y))."""
+    for a in range(inicio, fin, TAM_VISTA):
+        i = np.arange(a, min(a + TAM_VISTA, fin), dtype=np.int64)
+        x, y = np.divmod(i, 10000)
+        T[a:a + len(i)] = y * 10000 + (x * y // 100) % 10000
+
+
+# (estados, función que llena los sucesores, desfase del transitorio, desfase de hasta_cero)
+# En cuadrados medios el primer valor generado ya es f(semilla), por eso la
+# secuencia se vuelve periódica un paso antes que el estado. En productos
+# medios la salida k es la segunda cifra del estado k+1 y el estado k+1 es
+# (salida k-1, salida k): la secuencia se repite dos pasos antes que el par,
+# y por lo mismo el primer cero sale dos pasos antes de llegar a (0, 0).
+METODOS = {
+    "cuadrados": (10**4, _sucesores_cuadrados, 1, 1),
+    "productos": (10**8, _sucesores_productos, 2, 2),
+}
+
+
+# ---------------------- rondas (por tramos, también en el pool) ----------------------
+def _duplicar(J, J2, inicio, fin):
+    """J2 = J∘J: de saltos de 2^k pasos a saltos de 2^(k+1)."""
+    for a in range(inicio, fin, TAM_VISTA):
+        b = min(a + TAM_VISTA, fin)
+        J2[a:b] = J[J[a:b]]
+
+
+def _acumular(P, D, P2, D2, inicio, fin):
+    """Una ronda de distancias: D2 = D + D∘P, P2 = P∘P (los ciclos son absorbentes)."""
+    for a in range(inicio, fin, TAM_VISTA):
+        b = min(a + TAM_VISTA, fin)
+        p = P[a:b]
+        D2[a:b] = D[a:b] + D[p]
+        P2[a:b] = P[p]
+
+
+def _tramo(funcion, rutas, inicio, fin):
+    """Corre funcion sobre los arreglos .npy de rutas (lo usa el pool)."""
+    arreglos = [np.load(r, mmap_mode="r+") for r in rutas]
+    funcion(*arreglos, inicio, fin)
+    for a in arreglos:
+        a.flush()
+
+
+def _en_tramos(pool, workers, funcion, *arreglos):
+    """Aplica funcion a todo el espacio, repartido en workers tramos si hay pool."""
+    n = len(arreglos[0])
+    if pool is None:
+        funcion(*arreglos, 0, n)
+        return
+    for a in arreglos:
+        a.flush()
+    rutas = [a.filename for a in arreglos]
+    largo = -(-n // workers)
+    inicios = list(range(0, n, largo))
+    list(pool.map(_tramo, [funcion] * len(inicios), [rutas] * len(inicios),
+                  inicios, [min(i + largo, n) for i in inicios]))
+
+
+def _imagen(J, marca):
+    """Marca la imagen de J y devuelve cuántos estados tiene."""
+    marca[:] = False
+    for a in range(0, len(J), TAM_VISTA):
+        marca[J[a:a + TAM_VISTA]] = True
+    return int(np.count_nonzero(marca))
+
+
+def _entero(cota, con_signo=False):
+    """Tipo entero más chico que guarda 0..cota (y -1 si con_signo)."""
+    return np.min_scalar_type(-max(cota, 1) if con_signo else cota)
+
+
+# ---------------------- análisis ----------------------
+def analizar(metodo, directorio=DIRECTORIO, workers=None):
+    """
+    Analiza todas las semillas de metodo ("cuadrados" o "productos") y
+    guarda la tabla en directorio/metodo. Por semilla: transitorio (valores
+    antes de entrar al ciclo), periodo y hasta_cero (índice del primer 0
+    generado, -1 si nunca sale). workers > 1 reparte las rondas del espacio
+    de pares en un pool de procesos (por defecto, uno por CPU).
+    Devuelve la TablaSemillas ya abierta.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconocido: {metodo} (use {', '.join(METODOS)}).")
+    n, sucesores, desfase, desfase_cero = METODOS[metodo]
+    workers = workers or os.cpu_count() or 1
+    destino = os.path.join(directorio, metodo)
+    trabajo = destino + ".tmp"
+    shutil.rmtree(trabajo, ignore_errors=True)
+    os.makedirs(trabajo)
+    t0 = time.perf_counter()
+
+    # los arreglos del espacio de pares no caben cómodos en RAM varias veces:
+    # se trabajan como .npy mapeados, que además comparte el pool
+    en_disco = n > TAM_VISTA
+
+    def arreglo(nombre, dtype):
+        if en_disco:
+            return np.lib.format.open_memmap(os.path.join(trabajo, nombre + ".npy"),
+                                             mode="w+", dtype=dtype, shape=(n,))
+        return np.empty(n, dtype=dtype)
+
+    pool = None
+    if en_disco and workers > 1:
+        # se importa aquí, como en generar_paralelo
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+
+    def en_tramos(funcion, *arreglos):
+        _en_tramos(pool, workers, funcion, *arreglos)
+
+    try:
+        with etapa(f"sucesores ({metodo})", unidades=n):
+            T = arreglo("sucesores", np.int32)
+            en_tramos(sucesores, T)
+
+        # estados en ciclo: la imagen de f^(2^k) deja de achicarse cuando
+        # 2^k alcanza el transitorio más largo
+        with etapa(f"ciclos ({metodo})", unidades=n):
+            en_ciclo = np.zeros(n, dtype=bool)
+            J, J2 = arreglo("salto", np.int32), arreglo("salto2", np.int32)
+            J[:] = T
+            tam, rondas = _imagen(J, en_ciclo), 0
+            while True:
+                en_tramos(_duplicar, J, J2)
+                J, J2 = J2, J
+                rondas += 1
+                nuevo = _imagen(J, en_ciclo)
+                if nuevo == tam:
+                    break
+                tam = nuevo
+            nodos = np.flatnonzero(en_ciclo)
+            periodos = np.zeros(len(nodos), dtype=np.int64)
+            pendientes, z, k = np.arange(len(nodos)), T[nodos], 1
+            while pendientes.size:
+                listo = z == nodos[pendientes]
+                periodos[pendientes[listo]] = k
+                pendientes, z = pendientes[~listo], T[z[~listo]]
+                k += 1
+
+        # distancia de cada estado a su ciclo: los estados en ciclo apuntan a
+        # sí mismos con distancia 0 y las distancias se suman al duplicar
+        with etapa(f"transitorios ({metodo})", unidades=n):
+            cota = 1 << (rondas - 1)  # 2^(rondas-1) pasos ya llegaban al ciclo
+            tipo = _entero(cota)
+            P, P2 = J, J2
+            D, D2 = arreglo("distancia", tipo), arreglo("distancia2", tipo)
+            for a in range(0, n, TAM_VISTA):
+                b = min(a + TAM_VISTA, n)
+                c = en_ciclo[a:b]
+                P[a:b] = np.where(c, np.arange(a, b), T[a:b])
+                D[a:b] = ~c
+            for _ in range(rondas - 1):
+                en_tramos(_acumular, P, D, P2, D2)
+                P, P2, D, D2 = P2, P, D2, D
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    with etapa(f"tabla ({metodo})", unidades=n):
+        os.makedirs(directorio, exist_ok=True)
+        final = destino + ".nuevo"
+        shutil.rmtree(final, ignore_errors=True)
+        os.makedirs(final)
+        max_periodo = int(periodos.max())
+        columnas = {
+            "transitorio": _entero(cota),
+            "periodo": _entero(max_periodo),
+            "hasta_cero": _entero(cota, con_signo=True),
+        }
+        col = {c: np.lib.format.open_memmap(os.path.join(final, c + ".npy"), mode="w+",
+                                            dtype=t, shape=(n,))
+               for c, t in columnas.items()}
+        escala = cota + max_periodo + 1
+        clave = np.empty(n, dtype=_entero(max_periodo * escala + escala))
+        for a in range(0, n, TAM_VISTA):
+            b = min(a + TAM_VISTA, n)
+            p = P[a:b]
+            d = D[a:b].astype(np.int64)
+            periodo = periodos[np.searchsorted(nodos, p)]
+            transitorio = np.maximum(d - desfase, 0)
+            col["transitorio"][a:b] = transitorio
+            col["periodo"][a:b] = periodo
+            col["hasta_cero"][a:b] = np.where(p == 0, np.maximum(d - desfase_cero, 0), -1)
+            # orden: periodo descendente y, a igual periodo, más valores distintos primero
+            clave[a:b] = periodo * escala + transitorio + periodo
+        del P, P2, D, D2, T, J
+        # descendente con los empates por semilla: orden estable del arreglo invertido
+        orden = np.argsort(clave[::-1], kind="stable")[::-1].astype(_entero(n - 1))
+        np.subtract(n - 1, orden, out=orden)
+        del clave
+        np.save(os.path.join(final, "orden.npy"), orden)
+        ordenados = col["periodo"][orden]
+        inicios = np.concatenate([[0], np.flatnonzero(ordenados[1:] != ordenados[:-1]) + 1])
+        cantidades = np.diff(np.append(inicios, n))
+        distintos = ordenados[inicios]
+        del orden, ordenados
+        for c in col.values():
+            c.flush()
+        del col
+        meta = {
+            "metodo": metodo,
+            "version": VERSION,
+            "estados": n,
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "segundos": time.perf_counter() - t0,
+            "workers": workers if pool is not None else 1,
+            "rondas": rondas,
+            "estados_en_ciclo": len(nodos),
+            # [periodo, posición en orden, cantidad de semillas], de mayor a menor
+            "periodos": [[int(p), int(i), int(c)] for p, i, c in zip(distintos, inicios, cantidades)],
+        }
+        with open(os.path.join(final, "indice.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        shutil.rmtree(destino, ignore_errors=True)
+        os.replace(final, destino)
+        shutil.rmtree(trabajo, ignore_errors=True)
+    return TablaSemillas(destino)
+
+
+def abrir(metodo, directorio=DIRECTORIO, construir=True, workers=None):
+    """
+    Abre la tabla guardada de metodo; si no existe o es de una versión
+    anterior la construye (si construir).
+    """
+    ruta = os.path.join(directorio, metodo)
+    if os.path.exists(os.path.join(ruta, "indice.json")):
+        tabla = TablaSemillas(ruta)
+        if tabla.meta.get("version") == VERSION:
+            return tabla
+        del tabla
+        if not construir:
+            raise FileNotFoundError(f"La tabla de semillas de {metodo} en {directorio} es de una "
+                                    "versión anterior; reconstrúyala.")
+    elif not construir:
+        raise FileNotFoundError(f"No hay tabla de semillas para {metodo} en {directorio}.")
+    return analizar(metodo, directorio, workers)
+
+
+class TablaSemillas:
+    """
+    Tabla de un análisis guardado: columnas transitorio, periodo y
+    hasta_cero indexadas por estado (semilla, o x·10^4 + y para los pares)
+    como memmaps de solo lectura, y orden = estados de mayor a menor
+    periodo, así que las consultas leen solo las filas que devuelven.
+    """
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(os.path.join(ruta, "indice.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.metodo = self.meta["metodo"]
+        self.columnas = {c: np.load(os.path.join(ruta, c + ".npy"), mmap_mode="r") for c in COLUMNAS}
+        self.orden = np.load(os.path.join(ruta, "orden.npy"), mmap_mode="r")
+
+    def __len__(self):
+        return self.meta["estados"]
+
+    def semilla(self, estado):
+        """Estado -> semilla (un par (seed1, seed2) en productos medios)."""
+        if self.metodo == "productos":
+            return divmod(int(estado), 10000)
+        return int(estado)
+
+    def estado(self, semilla):
+        if self.metodo == "productos":
+            x, y = semilla
+            estado = int(x) * 10000 + int(y) if 0 <= x < 10000 and 0 <= y < 10000 else -1
+        else:
+            estado = int(semilla)
+        if not 0 <= estado < len(self):
+            raise ValueError(f"Semilla fuera de la tabla (4 dígitos): {semilla}")
+        return estado
+
+    def _filas(self, estados):
+        estados = np.asarray(estados, dtype=np.int64)
+        valores = {c: self.columnas[c][estados].tolist() for c in COLUMNAS}
+        return [{"semilla": self.semilla(e), **{c: valores[c][i] for c in COLUMNAS},
+                 "largo": valores["transitorio"][i] + valores["periodo"][i]}
+                for i, e in enumerate(estados.tolist())]
+
+    def fila(self, semilla):
+        """Resultados de una semilla; largo = valores distintos antes de repetir."""
+        return self._filas([self.estado(semilla)])[0]
+
+    def contar(self, periodo_min=1):
+        """Cuántas semillas tienen periodo >= periodo_min."""
+        return sum(c for p, _, c in self.meta["periodos"] if p >= periodo_min)
+
+    def mejores(self, periodo_min=1, cuantos=10):
+        """
+        Las cuantos semillas de mayor periodo con periodo >= periodo_min (a
+        igual periodo, las de secuencia más larga), como lista de filas.
+        """
+        return self._filas(self.orden[:min(int(cuantos), self.contar(periodo_min))])
+
+    def periodos(self):
+        """{periodo: cantidad de semillas}, de mayor a menor periodo."""
+        return {p: c for p, _, c in self.meta["periodos"]}
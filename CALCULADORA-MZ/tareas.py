@@ -0,0 +1,127 @@
+# tareas.py
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+
+class _Tarea:
+    """Estado de un trabajo en curso: futuro, progreso y bandera de cancelación."""
+    def __init__(self, clave, al_terminar, al_fallar):
+        self.clave = clave
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.cancelado = threading.Event()
+        self.avance = None  # (hechas, total), lo escribe el hilo de trabajo
+        self.futuro = None
+        self.registro = None  # Registro de rendimiento, si hay medidor
+
+    def reportar(self, hechas, total):
+        self.avance = (hechas, total)
+
+
+class PlanificadorTareas:
+    """
+    Ejecuta los trabajos pesados del dashboard en un pool de hilos para no
+    congelar Tkinter. El hilo de la GUI revisa los trabajos con after() y
+    llama a los callbacks (al_terminar, al_fallar) desde el propio hilo de Tk.
+    raiz: ventana de Tk
+    al_actualizar(texto, fraccion): refresca la barra de estado; fraccion es
+        None si el trabajo no informa avance y texto es "" cuando no queda nada
+        (o el último error que no se pudo entregar a al_fallar)
+    al_fallar(clave, error): manejador de errores por defecto
+    medidor: rendimiento.Medidor; cada trabajo queda registrado como una
+        acción, junto con el tiempo de su callback en el hilo de Tk
+    """
+    def __init__(self, raiz, workers=2, intervalo=50, al_actualizar=None,
+                 al_fallar=None, medidor=None):
+        self.raiz = raiz
+        self.medidor = medidor
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.intervalo = int(intervalo)
+        self.al_actualizar = al_actualizar
+        self.al_fallar = al_fallar
+        self.tareas = {}
+        self.aviso = ""  # último error que no pudo informarse con al_fallar
+
+    def lanzar(self, clave, funcion, *args, al_terminar=None, al_fallar=None,
+               con_progreso=False, **kwargs):
+        """
+        Envía funcion(*args, **kwargs) al pool. Si ya hay un trabajo con la
+        misma clave en curso, el clic se descarta y devuelve False.
+        con_progreso: además pasa progreso=(hechas, total) y cancelar=() -> bool
+        """
+        if clave in self.tareas:
+            return False
+        tarea = _Tarea(clave, al_terminar, al_fallar or self.al_fallar)
+        if con_progreso:
+            kwargs.update(progreso=tarea.reportar, cancelar=tarea.cancelado.is_set)
+        if self.medidor is not None:
+            tarea.registro = self.medidor.nuevo_registro(clave)
+            tarea.futuro = self.pool.submit(self.medidor.ejecutar, tarea.registro,
+                                            funcion, *args, **kwargs)
+        else:
+            tarea.futuro = self.pool.submit(funcion, *args, **kwargs)
+        self.tareas[clave] = tarea
+        self.aviso = ""
+        if len(self.tareas) == 1:
+            self.raiz.after(self.intervalo, self._revisar)
+        return True
+
+    def cancelar(self):
+        """Cancela todos los trabajos en curso; sus resultados se descartan."""
+        for tarea in self.tareas.values():
+            tarea.cancelado.set()
+            tarea.futuro.cancel()
+
+    def ocupado(self, clave=None):
+        return bool(self.tareas) if clave is None else clave in self.tareas
+
+    def _revisar(self):
+        # un callback que falla no debe cortar el sondeo: las demás tareas
+        # quedarían en self.tareas para siempre y sus clics se descartarían
+        try:
+            for clave, tarea in list(self.tareas.items()):
+                if not tarea.futuro.done():
+                    continue
+                del self.tareas[clave]
+                if tarea.cancelado.is_set() or tarea.futuro.cancelled():
+                    continue
+                error = tarea.futuro.exception()
+                if error is not None:
+                    self._fallar(tarea, error)
+                elif tarea.al_terminar is not None:
+                    try:
+                        if tarea.registro is not None:
+                            with self.medidor.en(tarea.registro, "al_terminar (GUI)"):
+                                tarea.al_terminar(tarea.futuro.result())
+                        else:
+                            tarea.al_terminar(tarea.futuro.result())
+                    except Exception as e:
+                        self._fallar(tarea, e)
+        finally:
+            try:
+                if self.al_actualizar is not None:
+                    self.al_actualizar(*self._estado())
+            finally:
+                if self.tareas:
+                    self.raiz.after(self.intervalo, self._revisar)
+
+    def _fallar(self, tarea, error):
+        """Pasa el error a al_fallar; si no hay o también falla, queda en la barra de estado."""
+        try:
+            if tarea.al_fallar is not None:
+                tarea.al_fallar(tarea.clave, error)
+                return
+        except Exception as e:
+            error = e
+        self.aviso = f"Error en {tarea.clave}: {error}"
+
+    def _estado(self):
+        if not self.tareas:
+            return self.aviso, 0.0
+        tarea = next(iter(self.tareas.values()))
+        texto = ", ".join(self.tareas)
+        if tarea.avance is None:
+            return f"En curso: {texto}", None
+        hechas, total = tarea.avance
+        return f"En curso: {texto} ({hechas}/{total})", hechas / max(total, 1)
+
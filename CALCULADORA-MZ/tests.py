@@ -1,31 +1,69 @@
 # tests.py
+import time
+
 import numpy as np
 from scipy import stats
 
-class PruebaMedia:
-    def __init__(self, numeros):
-        self.numeros = np.array(numeros, dtype=float)
+from generators import iter_bloques
+from rendimiento import largo_numeros, medido
 
-    def calcular(self):
-        n = len(self.numeros)
+class AcumuladorUniformidad:
+    """
+    Acumula en una sola pasada lo que necesitan las pruebas de media,
+    varianza y Chi²: cantidad, media y M2 (Welford, combinando bloques con
+    la fórmula de Chan) y frecuencias de k intervalos en [0, 1).
+    La memoria es O(k) sin importar cuántos números se consuman.
+    """
+    def __init__(self, k=10):
+        self.k = int(k)
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.frec = np.zeros(self.k, dtype=np.int64)
+
+    def agregar(self, bloque):
+        x = np.asarray(bloque, dtype=float).ravel()
+        nb = x.size
+        if nb == 0:
+            return self
+        media_b = x.mean()
+        m2_b = np.square(x - media_b).sum()
+        total = self.n + nb
+        delta = media_b - self.media
+        self.media += delta * nb / total
+        self.m2 += m2_b + delta * delta * self.n * nb / total
+        self.n = total
+        self.frec += np.histogram(x, bins=self.k, range=(0,1))[0]
+        return self
+
+    def consumir(self, datos):
+        """
+        Agrega datos en cualquiera de sus formas: una lista o arreglo, un
+        generador con iter_chunks() o un iterable de bloques.
+        """
+        for bloque in iter_bloques(datos):
+            self.agregar(bloque)
+        return self
+
+    def varianza(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+    def prueba_media(self):
+        n = self.n
         if n == 0:
             return "No hay datos para la prueba de media."
-        media = self.numeros.mean()
+        media = self.media
         # para U(0,1) media esperada 0.5, var = 1/12
         z = (media - 0.5) / np.sqrt(1.0/(12.0*n))
         # p-valor dos colas
         pval = 2 * (1 - stats.norm.cdf(abs(z)))
         return f"Media = {media:.4f}, Z = {z:.4f}, p-valor = {pval:.4f}"
 
-class PruebaVarianza:
-    def __init__(self, numeros):
-        self.numeros = np.array(numeros, dtype=float)
-
-    def calcular(self):
-        n = len(self.numeros)
+    def prueba_varianza(self):
+        n = self.n
         if n < 2:
             return "No hay suficientes datos para la prueba de varianza."
-        varianza = self.numeros.var(ddof=1)  # muestra
+        varianza = self.varianza()  # muestra
         # para U(0,1) var esperada = 1/12
         chi2 = (n-1) * varianza / (1.0/12.0)
         # p-valor (two-tail) no siempre útil pero lo calculamos
@@ -33,19 +71,310 @@ class PruebaVarianza:
         pval = 2 * min(p_lower, 1-p_lower)
         return f"Varianza (muestral) = {varianza:.6f}, Chi2 = {chi2:.4f}, p-valor ~ {pval:.4f}"
 
+    def prueba_chi2(self):
+        n = self.n
+        if n == 0:
+            return "No hay datos para Chi²."
+        esperada = n / self.k
+        chi2 = ((self.frec - esperada)**2 / esperada).sum()
+        pval = 1 - stats.chi2.cdf(chi2, df=self.k - 1)
+        return f"Chi² = {chi2:.4f} con {self.k-1} gl, p-valor = {pval:.4f}"
+
+class PruebaUniformidad:
+    """Media, varianza y Chi² en una sola pasada sobre los datos."""
+    def __init__(self, numeros, k=10):
+        self.numeros = numeros
+        self.k = int(k)
+
+    @medido(unidades=largo_numeros)
+    def calcular(self):
+        acc = AcumuladorUniformidad(self.k).consumir(self.numeros)
+        return "\n".join([acc.prueba_media(), acc.prueba_varianza(), acc.prueba_chi2()])
+
+class PruebaMedia:
+    def __init__(self, numeros):
+        self.numeros = numeros
+
+    @medido(unidades=largo_numeros)
+    def calcular(self):
+        return AcumuladorUniformidad().consumir(self.numeros).prueba_media()
+
+class PruebaVarianza:
+    def __init__(self, numeros):
+        self.numeros = numeros
+
+    @medido(unidades=largo_numeros)
+    def calcular(self):
+        return AcumuladorUniformidad().consumir(self.numeros).prueba_varianza()
+
 class PruebaChi2:
     def __init__(self, numeros, k=10):
-        self.numeros = np.array(numeros, dtype=float)
+        self.numeros = numeros
         self.k = int(k)
 
+    @medido(unidades=largo_numeros)
+    def calcular(self):
+        return AcumuladorUniformidad(self.k).consumir(self.numeros).prueba_chi2()
+
+# ====== BATERÍA EXTENDIDA ======
+# Cada prueba procesa los datos bloque a bloque (agregar) guardando solo lo
+# que necesita del bloque anterior, así que escala a muestras que no caben
+# en memoria; calcular() mantiene la interfaz de las pruebas anteriores.
+
+class _PruebaPorBloques:
+    def __init__(self, numeros=None):
+        self.numeros = numeros
+        self.reiniciar()
+
+    @medido(unidades=largo_numeros)
     def calcular(self):
-        n = len(self.numeros)
+        self.reiniciar()
+        for bloque in iter_bloques(self.numeros):
+            self.agregar(bloque)
+        return self.resultado()
+
+class PruebaCorridas(_PruebaPorBloques):
+    """Corridas arriba y abajo: cambios de signo entre diferencias consecutivas."""
+    def reiniciar(self):
+        self.n = 0
+        self.corridas = 0
+        self.ultimo = None
+        self.signo = None
+
+    def agregar(self, x):
+        if x.size == 0:
+            return
+        if self.ultimo is not None:
+            x = np.concatenate([[self.ultimo], x])
+        self.n += x.size - (self.ultimo is not None)
+        self.ultimo = x[-1]
+        if x.size < 2:
+            return
+        sube = x[1:] > x[:-1]
+        self.corridas += np.count_nonzero(sube[1:] != sube[:-1])
+        if self.signo is None:
+            self.corridas += 1
+        elif sube[0] != self.signo:
+            self.corridas += 1
+        self.signo = sube[-1]
+
+    def resultado(self):
+        n = self.n
+        if n < 3:
+            return "No hay suficientes datos para la prueba de corridas."
+        esperada = (2*n - 1) / 3.0
+        var = (16*n - 29) / 90.0
+        z = (self.corridas - esperada) / np.sqrt(var)
+        pval = 2 * (1 - stats.norm.cdf(abs(z)))
+        return f"Corridas arriba/abajo = {self.corridas}, E = {esperada:.2f}, Z = {z:.4f}, p-valor = {pval:.4f}"
+
+# manos del póker de 5 dígitos, indexadas por el patrón de igualdades entre
+# dígitos vecinos ya ordenados (4 bits)
+_MANOS = ["Todos diferentes", "Un par", "Dos pares", "Tercia",
+          "Full", "Póker", "Quintilla"]
+_P_MANOS = np.array([0.3024, 0.504, 0.108, 0.072, 0.009, 0.0045, 0.0001])
+
+def _tabla_manos():
+    tabla = np.zeros(16, dtype=np.int64)
+    for patron in range(16):
+        iguales = [(patron >> (3 - i)) & 1 for i in range(4)]
+        grupos, largo = [], 1
+        for eq in iguales:
+            if eq:
+                largo += 1
+            else:
+                grupos.append(largo)
+                largo = 1
+        grupos.append(largo)
+        grupos = sorted(grupos, reverse=True)
+        tabla[patron] = {(1, 1, 1, 1, 1): 0, (2, 1, 1, 1): 1, (2, 2, 1): 2,
+                         (3, 1, 1): 3, (3, 2): 4, (4, 1): 5, (5,): 6}[tuple(grupos)]
+    return tabla
+
+_TABLA_MANOS = _tabla_manos()
+
+class PruebaPoker(_PruebaPorBloques):
+    """Póker con los 5 primeros decimales de cada número."""
+    def reiniciar(self):
+        self.frec = np.zeros(len(_MANOS), dtype=np.int64)
+
+    def agregar(self, x):
+        v = np.minimum((x * 100000).astype(np.int64), 99999)
+        digitos = np.empty((v.size, 5), dtype=np.int8)
+        for i in range(5):
+            digitos[:, i] = v % 10
+            v //= 10
+        digitos.sort(axis=1)
+        iguales = digitos[:, 1:] == digitos[:, :-1]
+        patron = iguales @ np.array([8, 4, 2, 1])
+        self.frec += np.bincount(_TABLA_MANOS[patron], minlength=len(_MANOS))
+
+    def resultado(self):
+        n = self.frec.sum()
         if n == 0:
-            return "No hay datos para Chi²."
-        frec, _ = np.histogram(self.numeros, bins=self.k, range=(0,1))
-        esperada = n / self.k
-        chi2 = ((frec - esperada)**2 / esperada).sum()
-        # p-valor:
-        from scipy import stats
-        pval = 1 - stats.chi2.cdf(chi2, df=self.k - 1)
-        return f"Chi² = {chi2:.4f} con {self.k-1} gl, p-valor = {pval:.4f}"
+            return "No hay datos para la prueba de póker."
+        esperada = n * _P_MANOS
+        chi2 = ((self.frec - esperada)**2 / esperada).sum()
+        pval = 1 - stats.chi2.cdf(chi2, df=len(_MANOS) - 1)
+        return f"Póker: Chi² = {chi2:.4f} con {len(_MANOS)-1} gl, p-valor = {pval:.4f}"
+
+class PruebaHuecos(_PruebaPorBloques):
+    """
+    Huecos: longitud de las separaciones entre números que caen en
+    [alfa, beta); las longitudes >= t se agrupan en una sola clase.
+    """
+    def __init__(self, numeros=None, alfa=0.0, beta=0.5, t=5):
+        self.alfa, self.beta, self.t = float(alfa), float(beta), int(t)
+        super().__init__(numeros)
+
+    def reiniciar(self):
+        self.frec = np.zeros(self.t + 1, dtype=np.int64)
+        self.visto = 0
+        self.ultimo = None
+
+    def agregar(self, x):
+        pos = np.flatnonzero((x >= self.alfa) & (x < self.beta)) + self.visto
+        self.visto += x.size
+        if pos.size == 0:
+            return
+        if self.ultimo is not None:
+            pos = np.concatenate([[self.ultimo], pos])
+        self.ultimo = pos[-1]
+        huecos = np.diff(pos) - 1
+        self.frec += np.bincount(np.minimum(huecos, self.t), minlength=self.t + 1)
+
+    def resultado(self):
+        n = self.frec.sum()
+        if n == 0:
+            return "No hay huecos suficientes para la prueba de huecos."
+        p = self.beta - self.alfa
+        probs = p * (1 - p) ** np.arange(self.t + 1)
+        probs[-1] = (1 - p) ** self.t
+        esperada = n * probs
+        chi2 = ((self.frec - esperada)**2 / esperada).sum()
+        pval = 1 - stats.chi2.cdf(chi2, df=self.t)
+        return f"Huecos: {n} huecos, Chi² = {chi2:.4f} con {self.t} gl, p-valor = {pval:.4f}"
+
+class PruebaSeries(_PruebaPorBloques):
+    """Series: Chi² sobre pares no traslapados (x_2i, x_2i+1) en una malla k×k."""
+    def __init__(self, numeros=None, k=5):
+        self.k = int(k)
+        super().__init__(numeros)
+
+    def reiniciar(self):
+        self.frec = np.zeros(self.k * self.k, dtype=np.int64)
+        self.sobrante = None
+
+    def agregar(self, x):
+        if self.sobrante is not None:
+            x = np.concatenate([[self.sobrante], x])
+        self.sobrante = x[-1] if x.size % 2 else None
+        celdas = np.minimum((x[:x.size - x.size % 2] * self.k).astype(np.int64), self.k - 1)
+        self.frec += np.bincount(celdas[0::2] * self.k + celdas[1::2],
+                                 minlength=self.k * self.k)
+
+    def resultado(self):
+        n = self.frec.sum()
+        if n == 0:
+            return "No hay datos para la prueba de series."
+        esperada = n / self.k**2
+        chi2 = ((self.frec - esperada)**2 / esperada).sum()
+        gl = self.k**2 - 1
+        pval = 1 - stats.chi2.cdf(chi2, df=gl)
+        return f"Series ({self.k}x{self.k}): Chi² = {chi2:.4f} con {gl} gl, p-valor = {pval:.4f}"
+
+class PruebaAutocorrelacion(_PruebaPorBloques):
+    """
+    Autocorrelación de rezago k con media 0.5 y varianza 1/12 conocidas:
+    rho = 12/(n-k) · Σ (x_t - 0.5)(x_t+k - 0.5), Z = rho · sqrt(n-k).
+    """
+    def __init__(self, numeros=None, rezago=1):
+        self.rezago = int(rezago)
+        if self.rezago < 1:
+            # con k = 0, x[-k:] sería el bloque entero y no la cola
+            raise ValueError(f"rezago debe ser al menos 1 (se pidió {rezago}).")
+        super().__init__(numeros)
+
+    def reiniciar(self):
+        self.suma = 0.0
+        self.pares = 0
+        self.cola = np.empty(0)
+
+    def agregar(self, x):
+        x = np.concatenate([self.cola, x - 0.5])
+        k = self.rezago
+        if x.size > k:
+            self.suma += np.dot(x[:-k], x[k:])
+            self.pares += x.size - k
+        self.cola = x[-k:]
+
+    def resultado(self):
+        if self.pares == 0:
+            return "No hay suficientes datos para la prueba de autocorrelación."
+        rho = 12.0 * self.suma / self.pares
+        z = rho * np.sqrt(self.pares)
+        pval = 2 * (1 - stats.norm.cdf(abs(z)))
+        return f"Autocorrelación (rezago {self.rezago}) = {rho:.4f}, Z = {z:.4f}, p-valor = {pval:.4f}"
+
+class PruebaKS(_PruebaPorBloques):
+    """
+    Kolmogorov–Smirnov contra U(0,1). La distribución empírica se acumula en
+    un histograma de `intervalos` clases, así que D se evalúa en sus bordes
+    (error menor a 1/intervalos) sin ordenar toda la muestra.
+    """
+    def __init__(self, numeros=None, intervalos=1 << 20):
+        self.intervalos = int(intervalos)
+        super().__init__(numeros)
+
+    def reiniciar(self):
+        self.frec = np.zeros(self.intervalos, dtype=np.int64)
+
+    def agregar(self, x):
+        self.frec += np.histogram(x, bins=self.intervalos, range=(0,1))[0]
+
+    def resultado(self):
+        n = self.frec.sum()
+        if n == 0:
+            return "No hay datos para la prueba KS."
+        bordes = np.arange(1, self.intervalos + 1) / self.intervalos
+        acumulada = np.cumsum(self.frec) / n
+        # por arriba en el borde derecho, por abajo justo antes de cada salto
+        d = max(np.max(acumulada - bordes),
+                np.max(bordes - 1.0 / self.intervalos - np.concatenate([[0.0], acumulada[:-1]])),
+                0.0)
+        pval = stats.kstwo.sf(d, n)
+        return f"KS: D = {d:.5f}, n = {n}, p-valor = {pval:.4f}"
+
+class BateriaAleatoriedad:
+    """
+    Corre todas las pruebas en una sola pasada por bloques y reporta el
+    tiempo que consumió cada una.
+    """
+    def __init__(self, numeros, k=10):
+        self.numeros = numeros
+        self.k = int(k)
+
+    @medido(unidades=largo_numeros)
+    def calcular(self):
+        acc = AcumuladorUniformidad(self.k)
+        pruebas = [("Uniformidad", acc), ("Corridas", PruebaCorridas()),
+                   ("Póker", PruebaPoker()), ("Huecos", PruebaHuecos()),
+                   ("Series", PruebaSeries()), ("Autocorrelación", PruebaAutocorrelacion()),
+                   ("KS", PruebaKS())]
+        tiempos = dict.fromkeys((nombre for nombre, _ in pruebas), 0.0)
+        for bloque in iter_bloques(self.numeros):
+            for nombre, prueba in pruebas:
+                t0 = time.perf_counter()
+                prueba.agregar(bloque)
+                tiempos[nombre] += time.perf_counter() - t0
+
+        lineas = []
+        for nombre, prueba in pruebas:
+            t0 = time.perf_counter()
+            if prueba is acc:
+                texto = "\n".join([acc.prueba_media(), acc.prueba_varianza(), acc.prueba_chi2()])
+            else:
+                texto = prueba.resultado()
+            tiempos[nombre] += time.perf_counter() - t0
+            lineas.append(f"{texto}  [{tiempos[nombre]*1000:.1f} ms]")
+        return "\n".join(lineas)
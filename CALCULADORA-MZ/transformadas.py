@@ -0,0 +1,328 @@
+# transformadas.py
+import numpy as np
+
+from generators import TablaAlias, crear_rng, iter_bloques
+
+# Convierte una fuente de uniformes U(0,1) en variables de otra distribución.
+# La fuente puede ser cualquier cosa que acepte iter_bloques: un generador
+# clásico (CuadradosMedios, ...), una corrida guardada, un arreglo o una
+# FuenteNumpy. Cada transformada consume `uniformes` números por grupo y
+# produce `salida` variables por grupo, todo vectorizado por bloque.
+
+
+class FuenteNumpy:
+    """n uniformes de np.random.Generator, entregados por bloques como los generadores clásicos."""
+    def __init__(self, n, semilla=None, chunk_size=1 << 20):
+        self.n = int(n)
+        self.rng = crear_rng(semilla)
+        self.chunk_size = int(chunk_size)
+
+    def iter_chunks(self, chunk_size=None):
+        chunk_size = chunk_size or self.chunk_size
+        for inicio in range(0, self.n, chunk_size):
+            yield self.rng.random(min(chunk_size, self.n - inicio))
+
+
+class Transformada:
+    uniformes = 1  # uniformes por grupo
+    salida = 1     # variables por grupo
+
+    def __call__(self, u):
+        """u: matriz (grupos, uniformes) -> arreglo de grupos·salida variables."""
+        raise NotImplementedError
+
+    def distribucion(self):
+        """Distribución teórica (scipy.stats congelada) para verificar la salida."""
+        raise NotImplementedError
+
+    def es_discreta(self):
+        return False
+
+
+def _exp1(u):
+    # -ln(1-U) ~ Exp(1); con 1-U los generadores que devuelven 0 no dan log(0)
+    return -np.log1p(-u)
+
+
+class UniformeContinua(Transformada):
+    def __init__(self, a=0.0, b=1.0):
+        self.a, self.b = a, b
+
+    def __call__(self, u):
+        return self.a + (self.b - self.a) * u[:, 0]
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.uniform(loc=self.a, scale=self.b - self.a)
+
+
+class Exponencial(Transformada):
+    """Transformada inversa: -ln(1-U)/lam."""
+    def __init__(self, lam=1.0):
+        self.lam = lam
+
+    def __call__(self, u):
+        return _exp1(u[:, 0]) / self.lam
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.expon(scale=1.0 / self.lam)
+
+
+class Erlang(Transformada):
+    """Suma de k exponenciales: usa k uniformes por variable."""
+    def __init__(self, k=2, lam=1.0):
+        self.k, self.lam = int(k), lam
+        self.uniformes = self.k
+
+    def __call__(self, u):
+        return _exp1(u).sum(axis=1) / self.lam
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.erlang(self.k, scale=1.0 / self.lam)
+
+
+class Gamma(Transformada):
+    """Transformada inversa numérica (gammaincinv) para forma no entera."""
+    def __init__(self, alpha=2.0, lam=1.0):
+        self.alpha, self.lam = alpha, lam
+
+    def __call__(self, u):
+        from scipy.special import gammaincinv
+        return gammaincinv(self.alpha, u[:, 0]) / self.lam
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.gamma(self.alpha, scale=1.0 / self.lam)
+
+
+class Weibull(Transformada):
+    """Transformada inversa: lam·(-ln(1-U))^(1/k)."""
+    def __init__(self, k=1.5, lam=1.0):
+        self.k, self.lam = k, lam
+
+    def __call__(self, u):
+        return self.lam * _exp1(u[:, 0]) ** (1.0 / self.k)
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.weibull_min(c=self.k, scale=self.lam)
+
+
+class Normal(Transformada):
+    """Box–Muller: cada par de uniformes da dos normales independientes."""
+    uniformes = 2
+    salida = 2
+
+    def __init__(self, mu=0.0, sigma=1.0):
+        self.mu, self.sigma = mu, sigma
+
+    def __call__(self, u):
+        r = np.sqrt(2.0 * _exp1(u[:, 0]))
+        theta = 2.0 * np.pi * u[:, 1]
+        z = np.empty((len(u), 2))
+        z[:, 0] = r * np.cos(theta)
+        z[:, 1] = r * np.sin(theta)
+        return self.mu + self.sigma * z.ravel()
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.norm(loc=self.mu, scale=self.sigma)
+
+
+class TablaDiscreta(Transformada):
+    """
+    Transformada inversa por tabla para una distribución discreta: se
+    precalcula la acumulada de pmf una vez y cada uniforme se ubica con
+    búsqueda binaria (np.searchsorted) sobre la tabla. La tabla se arma en
+    el primer uso; las subclases que la sacan de scipy redefinen soporte().
+    """
+    def __init__(self, pmf=None, valores=None):
+        self._pmf, self._valores = pmf, valores
+        self._tabla = None
+
+    def soporte(self):
+        """(pmf, valores) de la distribución; valores None = 0..K-1."""
+        return self._pmf, self._valores
+
+    def tabla(self):
+        if self._tabla is None:
+            pmf, valores = self.soporte()
+            pmf = np.asarray(pmf, dtype=float)
+            valores = np.arange(len(pmf)) if valores is None else np.asarray(valores)
+            acumulada = np.cumsum(pmf / pmf.sum())
+            acumulada[-1] = 1.0
+            self._tabla = valores, acumulada
+        return self._tabla
+
+    def __call__(self, u):
+        valores, acumulada = self.tabla()
+        return valores[np.searchsorted(acumulada, u[:, 0], side="right")]
+
+    def es_discreta(self):
+        return True
+
+
+class Alias(Transformada):
+    """
+    Método de alias (generators.TablaAlias) para una pmf arbitraria: un
+    uniforme elige la columna y otro decide entre ella y su alias, así la
+    resolución limitada de los generadores clásicos no se reparte entre ambos.
+    """
+    uniformes = 2
+
+    def __init__(self, pmf, valores=None):
+        self.tabla = TablaAlias(pmf, valores)
+        self.pmf = np.asarray(pmf, dtype=float) / np.sum(pmf)
+
+    def __call__(self, u):
+        return self.tabla.desde_uniformes(u[:, 0], u[:, 1])
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.rv_discrete(values=(self.tabla.valores, self.pmf))
+
+    def es_discreta(self):
+        return True
+
+
+class UniformeDiscreta(TablaDiscreta):
+    def __init__(self, a=1, b=6):
+        self.a, self.b = int(a), int(b)
+        super().__init__(np.ones(self.b - self.a + 1), np.arange(self.a, self.b + 1))
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.randint(self.a, self.b + 1)
+
+
+class Bernoulli(TablaDiscreta):
+    def __init__(self, p=0.5):
+        self.p = p
+        super().__init__([1 - p, p])
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.bernoulli(self.p)
+
+
+class Binomial(TablaDiscreta):
+    def __init__(self, n_ensayos=10, p=0.5):
+        self.n_ensayos, self.p = int(n_ensayos), p
+        super().__init__()
+
+    def soporte(self):
+        from scipy import stats
+        return stats.binom.pmf(np.arange(self.n_ensayos + 1), self.n_ensayos, self.p), None
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.binom(self.n_ensayos, self.p)
+
+
+class Poisson(TablaDiscreta):
+    """La tabla se corta donde la cola restante es menor a 1e-16."""
+    def __init__(self, lam=3.0):
+        self.lam = lam
+        super().__init__()
+
+    def soporte(self):
+        from scipy import stats
+        maximo = int(stats.poisson.isf(1e-16, self.lam)) + 1
+        return stats.poisson.pmf(np.arange(maximo + 1), self.lam), None
+
+    def distribucion(self):
+        from scipy import stats
+        return stats.poisson(self.lam)
+
+
+# mismas distribuciones y parámetros por defecto que los dist_* del dashboard
+TRANSFORMADAS = {
+    "Uniforme continua": UniformeContinua(),
+    "Exponencial": Exponencial(),
+    "Erlang": Erlang(),
+    "Gamma": Gamma(),
+    "Normal": Normal(),
+    "Weibull": Weibull(),
+    "Uniforme discreta": UniformeDiscreta(),
+    "Bernoulli": Bernoulli(),
+    "Binomial": Binomial(),
+    "Poisson": Poisson(),
+}
+
+
+def uniformes_necesarias(transformada, n):
+    """Cuántos uniformes hacen falta para obtener n variables."""
+    grupos = -(-int(n) // transformada.salida)
+    return grupos * transformada.uniformes
+
+
+def transformar(fuente, transformada, n=None):
+    """
+    Genera por bloques las variables obtenidas al aplicar transformada a
+    los uniformes de fuente. Los uniformes que no completan un grupo pasan
+    al bloque siguiente; si se da n, se detiene al llegar a n variables.
+    """
+    k = transformada.uniformes
+    resto = np.empty(0)
+    producidas = 0
+    for bloque in iter_bloques(fuente):
+        if resto.size:
+            bloque = np.concatenate([resto, bloque])
+        completos = bloque.size - bloque.size % k
+        resto = bloque[completos:].copy()
+        if completos == 0:
+            continue
+        variables = transformada(bloque[:completos].reshape(-1, k))
+        if n is not None:
+            variables = variables[:n - producidas]
+        producidas += variables.size
+        yield variables
+        if n is not None and producidas >= n:
+            return
+
+
+def muestrear(fuente, transformada, n=None):
+    """Como transformar, pero devuelve todas las variables en un solo arreglo."""
+    bloques = list(transformar(fuente, transformada, n))
+    return np.concatenate(bloques) if bloques else np.empty(0)
+
+
+def calidad(variables, transformada):
+    """
+    p-valor de que las variables sigan la distribución teórica de la
+    transformada: KS si es continua, Chi² si es discreta. Las clases son
+    todo el soporte de la tabla más una clase para la masa de la cola, así
+    que los valores que no salen cuentan como 0 observados.
+    """
+    from scipy import stats
+    dist = transformada.distribucion()
+    if not transformada.es_discreta():
+        return stats.kstest(variables, dist.cdf).pvalue
+    if isinstance(transformada, Alias):
+        valores = np.unique(transformada.tabla.valores)
+    else:
+        valores = np.unique(transformada.tabla()[0])
+    variables = np.asarray(variables).ravel()
+    n = len(variables)
+    pos = np.minimum(np.searchsorted(valores, variables), len(valores) - 1)
+    dentro = valores[pos] == variables
+    observadas = np.append(np.bincount(pos[dentro], minlength=len(valores)),
+                           n - np.count_nonzero(dentro))
+    esperadas = n * dist.pmf(valores)
+    esperadas = np.append(esperadas, max(n - esperadas.sum(), 0.0))
+    # las clases con esperanza < 5 se juntan en una sola, y si aun así no
+    # llega a 5 se suma a la clase más chica de las demás
+    chicas = esperadas < 5
+    if chicas.any():
+        obs_chicas, esp_chicas = observadas[chicas].sum(), esperadas[chicas].sum()
+        observadas, esperadas = observadas[~chicas], esperadas[~chicas]
+        if esp_chicas >= 5 or not len(esperadas):
+            observadas = np.append(observadas, obs_chicas)
+            esperadas = np.append(esperadas, esp_chicas)
+        else:
+            i = esperadas.argmin()
+            observadas[i] += obs_chicas
+            esperadas[i] += esp_chicas
+    return stats.chisquare(observadas, esperadas).pvalue
@@ -1,42 +1,138 @@
 # utils.py
-import pandas as pd
 import matplotlib
 # For embedding matplotlib into Tkinter in Spyder it's safe to use TkAgg
 matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from tkinter import filedialog
-import csv
 import os
 
+import numpy as np
+
+from exportar import exportar_csv
+from generators import iter_bloques
+from rendimiento import medido
+
 # --- Exportación ---
+def pedir_ruta_exportacion():
+    return filedialog.asksaveasfilename(
+        defaultextension=".csv",
+        filetypes=[("CSV files", "*.csv"), ("NumPy", "*.npy"),
+                   ("float64 binario", "*.bin"), ("Parquet", "*.parquet"),
+                   ("Feather", "*.feather")])
+
 def export_csv(numeros):
     ruta = filedialog.asksaveasfilename(defaultextension=".csv",
                                         filetypes=[("CSV files", "*.csv")])
     if ruta:
-        with open(ruta, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Índice", "Número"])
-            for i, num in enumerate(numeros):
-                writer.writerow([i+1, float(num)])
+        exportar_csv(numeros, ruta)
         print(f"Archivo guardado en {ruta}")
 
+@medido(unidades=lambda resultado, datos, *args, **kwargs: len(datos))
 def exportar_a_excel(datos, nombre="datos.xlsx"):
+    import pandas as pd  # solo hace falta aquí y tarda en importarse
     df = pd.DataFrame(datos, columns=["Valores"])
     df.to_excel(nombre, index=False)
     print(f"Archivo guardado como {os.path.abspath(nombre)}")
 
 # --- Histogramas (embebidos en un frame de Tkinter) ---
-def mostrar_histograma(frame, numeros, titulo):
-    # destruir todos los widgets hijos del frame (para refrescar)
+@medido("histograma", unidades=lambda resultado, datos, *args, **kwargs: int(resultado[0].sum()))
+def histograma_por_bloques(datos, bins=30, rango=None):
+    """
+    Frecuencias y bordes del histograma (mismos intervalos que ax.hist)
+    acumulados bloque a bloque. Sin rango, datos se recorre dos veces: una
+    para el mínimo y máximo y otra para contar.
+    """
+    if rango is None:
+        lo, hi = np.inf, -np.inf
+        for bloque in iter_bloques(datos):
+            if bloque.size:
+                lo, hi = min(lo, bloque.min()), max(hi, bloque.max())
+        if lo > hi:
+            lo, hi = 0.0, 1.0
+        elif lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+        rango = (lo, hi)
+    frec = np.zeros(bins, dtype=np.int64)
+    for bloque in iter_bloques(datos):
+        frec += np.histogram(bloque, bins=bins, range=rango)[0]
+    return frec, np.linspace(rango[0], rango[1], bins + 1)
+
+class Histograma:
+    """
+    Histograma con una sola figura y un solo canvas por frame: cada
+    actualización cambia la altura y posición de las barras existentes en
+    lugar de crear otra figura. A matplotlib solo le llegan las frecuencias.
+    """
+    def __init__(self, frame):
+        self.fig = Figure(figsize=(6,3))
+        self.ax = self.fig.add_subplot()
+        self.ax.set_xlabel("Valor")
+        self.ax.set_ylabel("Frecuencia")
+        self.fig.tight_layout()
+        self.barras = None
+        self.canvas = FigureCanvasTkAgg(self.fig, master=frame)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=5, pady=5)
+
+    def vigente(self):
+        return bool(self.canvas.get_tk_widget().winfo_exists())
+
+    def actualizar(self, frec, bordes, titulo):
+        anchos = np.diff(bordes)
+        if self.barras is None or len(self.barras) != len(frec):
+            if self.barras is not None:
+                self.barras.remove()
+            self.barras = self.ax.bar(bordes[:-1], frec, width=anchos,
+                                      align="edge", edgecolor="black")
+        else:
+            for barra, x, ancho, alto in zip(self.barras, bordes[:-1], anchos, frec):
+                barra.set_x(x)
+                barra.set_width(ancho)
+                barra.set_height(alto)
+        margen = 0.05 * (bordes[-1] - bordes[0])
+        self.ax.set_xlim(bordes[0] - margen, bordes[-1] + margen)
+        self.ax.set_ylim(0, max(frec.max(), 1) * 1.05)
+        self.ax.set_title(f"Histograma - {titulo}")
+        self.canvas.draw_idle()
+
+_HISTOGRAMAS = {}
+
+@medido(unidades=None)
+def mostrar_histograma(frame, numeros, titulo, bins=30, frec=None, bordes=None):
+    """
+    Dibuja el histograma de numeros en frame reutilizando su figura.
+    Si ya se tienen las frecuencias (p. ej. calculadas en segundo plano)
+    se pasan como frec y bordes y numeros no se recorre.
+    """
+    if frec is None:
+        frec, bordes = histograma_por_bloques(numeros, bins)
+    hist = _HISTOGRAMAS.get(frame)
+    if hist is None or not hist.vigente():
+        # el frame se limpió (o muestra otra gráfica): nueva figura
+        for widget in frame.winfo_children():
+            widget.destroy()
+        hist = _HISTOGRAMAS[frame] = Histograma(frame)
+    hist.actualizar(frec, bordes, titulo)
+
+# --- Ensamble SIR: media y bandas de infectados ---
+def mostrar_bandas_sir(frame, resultado):
     for widget in frame.winfo_children():
         widget.destroy()
 
-    fig, ax = plt.subplots(figsize=(6,3))
-    ax.hist(numeros, bins=30, edgecolor="black")
-    ax.set_title(f"Histograma - {titulo}")
-    ax.set_xlabel("Valor")
-    ax.set_ylabel("Frecuencia")
+    fig = Figure(figsize=(6,3))
+    ax = fig.add_subplot()
+    pasos = range(resultado["media"].shape[2])
+    for i, p_inf in enumerate(resultado["p_infeccion"]):
+        for j, p_rec in enumerate(resultado["p_recuperacion"]):
+            linea, = ax.plot(pasos, resultado["media"][i, j, :, 1],
+                             label=f"β={p_inf:g}, γ={p_rec:g}")
+            ax.fill_between(pasos, resultado["bandas"][0, i, j, :, 1],
+                            resultado["bandas"][-1, i, j, :, 1],
+                            color=linea.get_color(), alpha=0.25)
+    ax.set_title("Ensamble SIR - infectados (media y bandas)")
+    ax.set_xlabel("Paso")
+    ax.set_ylabel("Infectados")
+    ax.legend(fontsize=7)
     fig.tight_layout()
 
     canvas = FigureCanvasTkAgg(fig, master=frame)